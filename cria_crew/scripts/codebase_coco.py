@@ -4,9 +4,15 @@ from pgvector.psycopg import register_vector
 from typing import Any
 import cocoindex
 import os
+import sys
 from numpy.typing import NDArray
 import numpy as np
 
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from cria_crew.tools.utils.embedding_runtime import sentence_transformer_args
+
+CODE_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
 @cocoindex.op.function()
 def extract_extension(filename: str) -> str:
     """Extract the extension of a filename."""
@@ -29,7 +35,8 @@ def code_to_embedding(
     #    )
     return text.transform(
         cocoindex.functions.SentenceTransformerEmbed(
-            model="sentence-transformers/all-MiniLM-L6-v2"
+            model=CODE_EMBEDDING_MODEL,
+            args=sentence_transformer_args(CODE_EMBEDDING_MODEL, serializable=True) or None,
         )
     )
 
@@ -0,0 +1,76 @@
+"""
+Export the embedding model to ONNX, quantize it to int8 and check parity with fp32.
+
+Usage:
+    python scripts/export_onnx_embedding.py --output models/bge-base-onnx
+
+Then set EMBEDDING_RUNTIME=onnx and EMBEDDING_ONNX_PATH=models/bge-base-onnx. The script
+exits non-zero when the quantized vectors drift below --min-cosine from the fp32 ones.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+
+from dotenv import load_dotenv
+from sentence_transformers import SentenceTransformer
+from sentence_transformers.backend import export_dynamic_quantized_onnx_model
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from cria_crew.tools.utils.embedding_runtime import DEFAULT_QUANTIZED_FILE, check_embedding_parity
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+
+SAMPLE_TEXTS = [
+    "Login fails with SSO when the session cookie expires",
+    "TMS-123 seat_limit reached while assigning trainees to a course",
+    "Database queries on the training schedule page are slow",
+    "Update training mode from classroom to virtual",
+    "API returns 500 when uploading a certificate PDF",
+    "How to configure the notification service for course reminders",
+    "Mobile UI buttons overlap on small screens",
+    "Release checklist for the training management system",
+    "Security review of the file upload endpoint",
+    "Meeting notes: sprint planning for the reporting module",
+]
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Export and quantize the embedding model to ONNX")
+    parser.add_argument("--model", default=os.getenv("EMBEDDING_MODEL_NAME", "BAAI/bge-base-en-v1.5"))
+    parser.add_argument("--output", required=True, help="Directory to write the ONNX model to")
+    parser.add_argument("--quantization", default="avx512_vnni", choices=["arm64", "avx2", "avx512", "avx512_vnni"])
+    parser.add_argument("--min-cosine", type=float, default=0.99)
+    parser.add_argument("--texts-file", help="Optional file with one sample text per line for the parity check")
+    args = parser.parse_args()
+
+    logging.info(f"📦 Exporting {args.model} to ONNX in {args.output}")
+    onnx_model = SentenceTransformer(args.model, backend="onnx")
+    onnx_model.save_pretrained(args.output)
+
+    logging.info(f"🗜️ Quantizing to int8 ({args.quantization})")
+    export_dynamic_quantized_onnx_model(onnx_model, args.quantization, args.output)
+    quantized_file = f"onnx/model_qint8_{args.quantization}.onnx"
+    if quantized_file != DEFAULT_QUANTIZED_FILE:
+        logging.info(f"ℹ️ Set EMBEDDING_ONNX_FILE={quantized_file} to use this model")
+
+    texts = SAMPLE_TEXTS
+    if args.texts_file:
+        with open(args.texts_file, encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+
+    reference = SentenceTransformer(args.model, device="cpu")
+    quantized = SentenceTransformer(args.output, backend="onnx", model_kwargs={"file_name": quantized_file})
+    report = check_embedding_parity(reference, quantized, texts, min_cosine=args.min_cosine)
+    logging.info(f"📊 Parity report: {json.dumps(report)}")
+    if not report["passed"]:
+        logging.error("❌ Quantized model drifted from fp32 beyond the allowed threshold")
+        sys.exit(1)
+    logging.info("✅ Quantized model is within tolerance")
+
+
+if __name__ == "__main__":
+    main()
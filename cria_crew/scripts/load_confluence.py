@@ -15,6 +15,8 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
 from scripts.clients import ConfluenceClient
 from cria_crew.tools.utils.vector_store import get_confluence_vectorstore
+from cria_crew.tools.utils.result_cache import bump_index_generation
+from cria_crew.tools.utils.embedding_runtime import sentence_transformer_args
 
 
 # --- Constants ---
@@ -26,7 +28,11 @@ vector_store = get_confluence_vectorstore()
 confluence = ConfluenceClient()
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 embedding_model_name = os.getenv("EMBEDDING_MODEL_NAME", "BAAI/bge-base-en-v1.5")
-embed_model = HuggingFaceEmbedding(model_name="BAAI/bge-small-en-v1.5")
+# Semantic splitter embeddings follow EMBEDDING_RUNTIME (torch or ONNX on CPU)
+embed_model = HuggingFaceEmbedding(
+    model_name="BAAI/bge-small-en-v1.5",
+    **sentence_transformer_args("BAAI/bge-small-en-v1.5"),
+)
 
 def embed_and_store(page):
     title = page["title"]
@@ -68,19 +74,32 @@ def embed_and_store(page):
 
     logging.info(f"Indexing Confluence page {page_id} with {len(documents)} semantic chunks.")
 
-    # Vector store upsert
-    vector_store.upsert_documents(documents)
+    # Vector store upsert (batched encode + chunked parallel upload)
+    report = vector_store.upsert_documents(documents)
+    if not report.ok:
+        logging.warning(f"⚠️ {len(report.failed_chunks)} chunk(s) failed for page {page_id}: {report.failed_chunks}")
+
+    # Keep the BM25 index in step with what actually reached the vector index
+    failed_ids = {vid for failed in report.failed_chunks for vid in failed["ids"]}
+    vector_store.lexical_index.add_documents(doc for doc in documents if doc["id"] not in failed_ids)
+    return report
 def main():
     logging.info("🔍 Fetching Confluence pages...")
     pages = confluence.get_pages()
     logging.info(f"📦 Retrieved {len(pages)} pages. Starting embedding and storage...")
 
+    upserted = 0
     for page in tqdm(pages, desc="🔄 Embedding pages"):
         try:
-            embed_and_store(page)
+            upserted += embed_and_store(page).upserted_count
         except Exception as e:
             logging.warning(f"⚠️ Failed to process page {page.get('id')}: {e}")
 
+    # Invalidate cached search results now that the index has changed
+    if upserted:
+        vector_store.lexical_index.save()
+        bump_index_generation(vector_store.index_name)
+
     logging.info("✅ Done embedding and storing Confluence pages.")
 
 if __name__ == "__main__":
@@ -13,6 +13,8 @@ from llama_index.embeddings.huggingface import HuggingFaceEmbedding
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
 from cria_crew.tools.utils.vector_store import get_jira_vectorstore
+from cria_crew.tools.utils.result_cache import bump_index_generation
+from cria_crew.tools.utils.embedding_runtime import sentence_transformer_args
 
 load_dotenv()
 
@@ -29,7 +31,11 @@ CHUNK_OVERLAP = 50
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 embedding_model_name = os.getenv("EMBEDDING_MODEL_NAME", "BAAI/bge-base-en-v1.5")
-embed_model = HuggingFaceEmbedding(model_name="BAAI/bge-small-en-v1.5")
+# Semantic splitter embeddings follow EMBEDDING_RUNTIME (torch or ONNX on CPU)
+embed_model = HuggingFaceEmbedding(
+    model_name="BAAI/bge-small-en-v1.5",
+    **sentence_transformer_args("BAAI/bge-small-en-v1.5"),
+)
 # Initialize vector store
 vector_store = get_jira_vectorstore()
 
@@ -179,20 +185,33 @@ def embed_and_store(issue):
         })
     logging.info(f"Indexing issue {issue['key']} with {len(documents)} chunks.")
 
-    # Vector store upsert (batch if needed)
-    vector_store.upsert_documents(documents)
+    # Vector store upsert (batched encode + chunked parallel upload)
+    report = vector_store.upsert_documents(documents)
+    if not report.ok:
+        logging.warning(f"⚠️ {len(report.failed_chunks)} chunk(s) failed for issue {key}: {report.failed_chunks}")
+
+    # Keep the BM25 index in step with what actually reached the vector index
+    failed_ids = {vid for failed in report.failed_chunks for vid in failed["ids"]}
+    vector_store.lexical_index.add_documents(doc for doc in documents if doc["id"] not in failed_ids)
+    return report
 
 def main():
     logging.info("🔍 Fetching Jira issues...")
     issues = fetch_all_issues()
     logging.info(f"📦 Retrieved {len(issues)} issues. Starting embedding and storage...")
 
+    upserted = 0
     for issue in tqdm(issues, desc="🔄 Embedding issues"):
         try:
-            embed_and_store(issue)
+            upserted += embed_and_store(issue).upserted_count
         except Exception as e:
             logging.warning(f"⚠️ Failed to process issue {issue.get('key')}: {e}")
 
+    # Invalidate cached search results now that the index has changed
+    if upserted:
+        vector_store.lexical_index.save()
+        bump_index_generation(vector_store.index_name)
+
     logging.info("✅ Done embedding and storing Jira issues.")
     
     # Print index statistics
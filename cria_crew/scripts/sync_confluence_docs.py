@@ -10,6 +10,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
 
 from cria_crew.tools.utils.vector_store import get_confluence_vectorstore
+from cria_crew.tools.utils.result_cache import bump_index_generation
 from scripts.clients import ConfluenceClient
 
 logging.basicConfig(level=logging.INFO)
@@ -67,7 +68,14 @@ def sync_confluence_pages():
     # Step 3: Upsert
     if docs_to_upsert:
         logging.info(f"📤 Upserting {len(docs_to_upsert)} new/updated pages...")
-        store.upsert_documents(docs_to_upsert)
+        report = store.upsert_documents(docs_to_upsert)
+        for failed in report.failed_chunks:
+            logging.error(f"❌ {failed['stage']} failed for {len(failed['ids'])} pages: {failed['error']}")
+        if report.upserted_count:
+            failed_ids = {vid for failed in report.failed_chunks for vid in failed["ids"]}
+            store.lexical_index.add_documents(doc for doc in docs_to_upsert if doc["id"] not in failed_ids)
+            store.lexical_index.save()
+            bump_index_generation(store.index_name)
     else:
         logging.info("✅ No new or updated Confluence pages to upsert.")
 
@@ -10,6 +10,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
 
 from cria_crew.tools.utils.vector_store import get_jira_vectorstore
+from cria_crew.tools.utils.result_cache import bump_index_generation
 from scripts.clients import JiraClient
 
 logging.basicConfig(level=logging.INFO)
@@ -65,7 +66,14 @@ def sync_jira_issues():
     # Step 3: Upsert only the changed or new ones
     if docs_to_upsert:
         logging.info(f"📤 Upserting {len(docs_to_upsert)} issues...")
-        store.upsert_documents(docs_to_upsert)
+        report = store.upsert_documents(docs_to_upsert)
+        for failed in report.failed_chunks:
+            logging.error(f"❌ {failed['stage']} failed for {len(failed['ids'])} issues: {failed['error']}")
+        if report.upserted_count:
+            failed_ids = {vid for failed in report.failed_chunks for vid in failed["ids"]}
+            store.lexical_index.add_documents(doc for doc in docs_to_upsert if doc["id"] not in failed_ids)
+            store.lexical_index.save()
+            bump_index_generation(store.index_name)
     else:
         logging.info("✅ No new or updated Jira issues to upsert")
 
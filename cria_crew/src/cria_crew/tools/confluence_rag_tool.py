@@ -1,4 +1,6 @@
 from .utils.data_model import VectorStore
+from .utils.vector_store import get_vectorstore
+from .utils.reranker import get_reranker
 import os
 from crewai.tools import BaseTool
 
@@ -14,11 +16,8 @@ class ConfluenceRAGTool(BaseTool):
     #     )
     
     def _get_vector_store(self, index_name, model_name) -> VectorStore:
-        """Get or create vector store instance."""
-        return VectorStore(
-            index_name=index_name,
-            embedding_model_name=model_name
-        )
+        """Get the shared vector store instance (models and indexes are loaded once per process)."""
+        return get_vectorstore(index_name=index_name, embedding_model_name=model_name)
 
     def _run(self, query: str) -> str:
         """Run the tool to search Confluence for relevant pages."""
@@ -26,7 +25,8 @@ class ConfluenceRAGTool(BaseTool):
             index_name=os.getenv("CONFLUENCE_INDEX_NAME", "confluence-pages"),
             model_name=os.getenv("EMBEDDING_MODEL_NAME", "BAAI/bge-base-en-v1.5")
         )
-        rag_context = vs.search(query)
+        reranker = get_reranker()
+        rag_context = reranker.rerank(query, vs.search(query, top_k=reranker.fetch_k(10)))
         if not rag_context:
             return "No relevant Confluence pages found."
         
@@ -7,6 +7,9 @@ from numpy.typing import NDArray
 from pgvector.psycopg import register_vector
 from crewai.tools import BaseTool
 from sqlalchemy import text
+from .utils.embedding_runtime import sentence_transformer_args
+
+CODE_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
 
 @cocoindex.op.function()
 def extract_extension(filename: str) -> str:
@@ -35,7 +38,8 @@ def code_to_embedding(
     # )
     return text.transform(
         cocoindex.functions.SentenceTransformerEmbed(
-            model="sentence-transformers/all-MiniLM-L6-v2"
+            model=CODE_EMBEDDING_MODEL,
+            args=sentence_transformer_args(CODE_EMBEDDING_MODEL, serializable=True) or None,
         )
     )
     # return text.transform(
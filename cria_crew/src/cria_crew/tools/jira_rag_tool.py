@@ -1,4 +1,6 @@
 from .utils.data_model import VectorStore
+from .utils.vector_store import get_vectorstore
+from .utils.reranker import get_reranker
 from crewai.tools import BaseTool
 import os
 class JiraSearchTool(BaseTool):
@@ -10,18 +12,17 @@ class JiraSearchTool(BaseTool):
     )
     
     def _get_vector_store(self, index_name, model_name) -> VectorStore:
-        """Get or create vector store instance."""
-        return VectorStore(
-            index_name=index_name,
-            embedding_model_name=model_name
-        )
+        """Get the shared vector store instance (models and indexes are loaded once per process)."""
+        return get_vectorstore(index_name=index_name, embedding_model_name=model_name)
     
     def _run(self, query: str) -> str:
         vs = self._get_vector_store(
             index_name=os.getenv("JIRA_INDEX_NAME", "jira-issues"),
             model_name=os.getenv("EMBEDDING_MODEL_NAME", "BAAI/bge-base-en-v1.5")
         )
-        search_results = vs.search(query)
+        reranker = get_reranker()
+        search_results = vs.search(query, top_k=reranker.fetch_k(10))
+        search_results = reranker.rerank(query, search_results)
         context_texts = []
         for result in search_results:
             metadata = result.get('metadata', {})
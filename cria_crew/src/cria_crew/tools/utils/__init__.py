@@ -1,6 +1,35 @@
 """Utility modules for cria_crew tools."""
 
-from .data_model import VectorStore
-from .vector_store import get_jira_vectorstore, get_confluence_vectorstore
+from .data_model import MultiSearchResult, UpsertReport, VectorStore
+from .embedding_cache import QueryEmbeddingCache, get_query_embedding_cache
+from .lexical_index import BM25Index, get_lexical_index, reciprocal_rank_fusion
+from .local_index import LocalIndex
+from .reranker import Reranker, get_reranker
+from .result_cache import (
+    InMemoryResultCache,
+    SqliteResultCache,
+    bump_index_generation,
+    get_result_cache,
+)
+from .vector_store import get_vectorstore, get_jira_vectorstore, get_confluence_vectorstore
 
-__all__ = ['VectorStore', 'get_jira_vectorstore', 'get_confluence_vectorstore']
+__all__ = [
+    'QueryEmbeddingCache',
+    'get_query_embedding_cache',
+    'BM25Index',
+    'get_lexical_index',
+    'reciprocal_rank_fusion',
+    'LocalIndex',
+    'Reranker',
+    'get_reranker',
+    'InMemoryResultCache',
+    'SqliteResultCache',
+    'bump_index_generation',
+    'get_result_cache',
+    'MultiSearchResult',
+    'UpsertReport',
+    'VectorStore',
+    'get_vectorstore',
+    'get_jira_vectorstore',
+    'get_confluence_vectorstore',
+]
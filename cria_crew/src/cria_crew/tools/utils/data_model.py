@@ -1,19 +1,62 @@
+import asyncio
+import functools
+import json
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Tuple
 from pydantic import BaseModel, Field
-from pinecone import Pinecone, PineconeException
-from sentence_transformers import SentenceTransformer
+from pinecone import PineconeException
 import os
+from . import registry
+from .embedding_cache import get_query_embedding_cache
+from .lexical_index import get_lexical_index, reciprocal_rank_fusion
+from .local_index import matches_filter
+from .result_cache import get_result_cache, make_result_key
+
+
+class UpsertReport(BaseModel):
+    """Outcome of a batched upsert: counts, per-batch timings and failed chunks."""
+    total_documents: int = 0
+    upserted_count: int = 0
+    encode_batches: List[Dict[str, Any]] = Field(default_factory=list)
+    upsert_chunks: List[Dict[str, Any]] = Field(default_factory=list)
+    failed_chunks: List[Dict[str, Any]] = Field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed_chunks
+
+
+class MultiSearchResult(BaseModel):
+    """Results of ``search_many`` in input order, with per-query latency."""
+    results: List[List[Dict[str, Any]]] = Field(default_factory=list)
+    latencies: List[float] = Field(default_factory=list)
+    errors: List[Optional[str]] = Field(default_factory=list)
+    encode_seconds: float = 0.0
+
+
 class VectorStore:
-    def __init__(self, index_name: str, embedding_model_name: Optional[str] = None):
+    def __init__(self, index_name: str, embedding_model_name: Optional[str] = None, device: Optional[str] = None):
         self.index_name = index_name
         self.embedding_model_name = embedding_model_name or os.getenv("EMBEDDING_MODEL_NAME", "BAAI/bge-base-en-v1.5")
-        logging.info(f"🔎 Loading embedding model: {self.embedding_model_name}")
-        self.embedding_model = SentenceTransformer(self.embedding_model_name)
-        self.pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
+        self.encode_batch_size = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+        self.upsert_batch_size = int(os.getenv("UPSERT_BATCH_SIZE", "100"))
+        # Pinecone rejects upsert requests above 2MB; stay under it with some headroom.
+        self.upsert_max_bytes = int(os.getenv("UPSERT_MAX_BYTES", str(2 * 1024 * 1024 - 64 * 1024)))
+        self.upsert_max_workers = int(os.getenv("UPSERT_MAX_WORKERS", "4"))
+        self.embedding_version = os.getenv("EMBEDDING_VERSION", "bge-v1.5")
+        self.query_cache = get_query_embedding_cache() if int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "4096")) > 0 else None
+        self.result_cache = get_result_cache()
+        self.hybrid = os.getenv("HYBRID_SEARCH", "false").lower() in ("1", "true", "yes")
+        self.rrf_k = int(os.getenv("HYBRID_RRF_K", "60"))
+        self.device = device or registry.default_device()
+        # Models, clients and index handles are shared process-wide via the registry.
+        self.embedding_model = registry.get_embedding_model(self.embedding_model_name, self.device)
+        self.backend = registry.vector_backend()
+        self.pc = registry.get_pinecone_client() if self.backend == "pinecone" else None
         try:
-            self.index = self.pc.Index(self.index_name)
-            logging.info(f"✅ Connected to Pinecone index: {self.index_name}")
+            self.index = registry.get_index(self.index_name, self.backend)
         except PineconeException as e:
             logging.error(f"❌ Failed to connect to Pinecone index '{self.index_name}': {e}")
             raise
@@ -22,6 +65,50 @@ class VectorStore:
         """Generate dense vector for a single text input."""
         return self.embedding_model.encode(text, convert_to_numpy=True).tolist()
 
+    def embed_query(self, query: str) -> List[float]:
+        """Dense vector for a search query, served from the query embedding cache when possible."""
+        if self.query_cache is None:
+            return self.embed_text(query)
+        cached = self.query_cache.get(self.embedding_model_name, query, self.embedding_version)
+        if cached is None:
+            vector = self.embedding_model.encode(query, convert_to_numpy=True)
+            cached = self.query_cache.put(self.embedding_model_name, query, vector, self.embedding_version)
+        return cached.tolist()
+
+    def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Dense vectors for many queries: cache hits are reused, misses go through one batched encode."""
+        if self.query_cache is None:
+            return self.embed_texts(queries)
+        vectors: List[Optional[List[float]]] = []
+        misses: Dict[str, List[int]] = {}
+        for i, query in enumerate(queries):
+            cached = self.query_cache.get(self.embedding_model_name, query, self.embedding_version)
+            if cached is None:
+                misses.setdefault(query, []).append(i)
+                vectors.append(None)
+            else:
+                vectors.append(cached.tolist())
+        if misses:
+            encoded = self.embedding_model.encode(
+                list(misses), batch_size=self.encode_batch_size, convert_to_numpy=True
+            )
+            for (query, positions), vector in zip(misses.items(), encoded):
+                stored = self.query_cache.put(self.embedding_model_name, query, vector, self.embedding_version).tolist()
+                for i in positions:
+                    vectors[i] = stored
+        return vectors
+
+    def embed_texts(self, texts: List[str], batch_size: Optional[int] = None) -> List[List[float]]:
+        """Generate dense vectors for many texts with a single batched encode call."""
+        if not texts:
+            return []
+        vectors = self.embedding_model.encode(
+            texts,
+            batch_size=batch_size or self.encode_batch_size,
+            convert_to_numpy=True,
+        )
+        return vectors.tolist()
+
     def _sanitize_metadata(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
         """Ensure metadata values are primitive types."""
         def sanitize(value):
@@ -35,54 +122,375 @@ class VectorStore:
 
         return {k: sanitize(v) for k, v in metadata.items()}
 
-    def search(self, query: str, top_k: int = 10, filter_dict: Optional[Dict] = None) -> List[Dict[str, Any]]:
-        """Semantic search with optional metadata filter."""
-        try:
-            query_vector = self.embed_text(query)
-            kwargs = {
-                "vector": query_vector,
-                "top_k": top_k,
-                "include_metadata": True,
-                "include_values": False
+    def query_by_vector(
+        self,
+        query_vector: List[float],
+        top_k: int = 10,
+        filter_dict: Optional[Dict] = None,
+        use_cache: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """Run an index query for an already-encoded vector (raises on index errors)."""
+        cache_key = None
+        if use_cache and self.result_cache is not None:
+            generation = self.result_cache.get_generation(self.index_name)
+            cache_key = make_result_key(self.index_name, generation, query_vector, top_k, filter_dict)
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        kwargs = {
+            "vector": query_vector,
+            "top_k": top_k,
+            "include_metadata": True,
+            "include_values": False
+        }
+        if filter_dict:
+            kwargs["filter"] = filter_dict
+
+        results = self.index.query(**kwargs)
+
+        # Extract matches from Pinecone results
+        matches = getattr(results, 'matches', [])
+
+        formatted = [
+            {
+                "id": getattr(match, 'id', match.get('id', '')),
+                "score": getattr(match, 'score', match.get('score', 0.0)),
+                "metadata": dict(getattr(match, 'metadata', match.get('metadata', {})) or {})
             }
-            if filter_dict:
-                kwargs["filter"] = filter_dict
-
-            results = self.index.query(**kwargs)
-            
-            # Extract matches from Pinecone results
-            matches = getattr(results, 'matches', [])
-        
-            return [
-                {
-                    "id": getattr(match, 'id', match.get('id', '')),
-                    "score": getattr(match, 'score', match.get('score', 0.0)),
-                    "metadata": getattr(match, 'metadata', match.get('metadata', {}))
-                }
-                for match in matches
-            ]
+            for match in matches
+        ]
+        if cache_key is not None:
+            self.result_cache.put(cache_key, self.index_name, generation, formatted)
+        return formatted
+
+    @property
+    def lexical_index(self):
+        """BM25 index built alongside this vector index by the load/sync scripts."""
+        return get_lexical_index(self.index_name)
+
+    def _fetch_metadata(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        if not ids:
+            return {}
+        vectors = getattr(self.index.fetch(ids=ids), "vectors", {}) or {}
+        return {
+            vid: dict((v.get("metadata") if isinstance(v, dict) else getattr(v, "metadata", None)) or {})
+            for vid, v in vectors.items()
+        }
+
+    def fuse_lexical(
+        self,
+        query: str,
+        dense: List[Dict[str, Any]],
+        top_k: int = 10,
+        filter_dict: Optional[Dict] = None,
+    ) -> List[Dict[str, Any]]:
+        """Fuse dense hits with BM25 hits using reciprocal rank fusion."""
+        lexical = self.lexical_index.search(query, top_k=max(top_k * 2, 20))
+        if not lexical:
+            return dense[:top_k]
+        by_id = {hit["id"]: hit for hit in dense}
+        dense_ids = set(by_id)
+        fused = reciprocal_rank_fusion([[hit["id"] for hit in dense], [doc_id for doc_id, _ in lexical]], k=self.rrf_k)
+        # Lexical-only hits have no metadata yet: fetch it and apply the same filter.
+        missing = [doc_id for doc_id, _ in fused[:top_k * 2] if doc_id not in by_id]
+        for doc_id, metadata in self._fetch_metadata(missing).items():
+            if matches_filter(metadata, filter_dict):
+                by_id[doc_id] = {"id": doc_id, "score": 0.0, "metadata": metadata}
+        lexical_scores = dict(lexical)
+        results = []
+        for doc_id, rrf_score in fused:
+            hit = by_id.get(doc_id)
+            if hit is None:
+                continue
+            results.append({
+                **hit,
+                "score": rrf_score,
+                "dense_score": hit["score"] if doc_id in dense_ids else None,
+                "lexical_score": lexical_scores.get(doc_id),
+            })
+            if len(results) >= top_k:
+                break
+        return results
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        filter_dict: Optional[Dict] = None,
+        use_cache: bool = True,
+        hybrid: Optional[bool] = None,
+    ) -> List[Dict[str, Any]]:
+        """Semantic search with optional metadata filter, result caching and BM25 fusion."""
+        try:
+            query_vector = self.embed_query(query)
+            if not (self.hybrid if hybrid is None else hybrid):
+                return self.query_by_vector(query_vector, top_k, filter_dict, use_cache)
+            dense = self.query_by_vector(query_vector, max(top_k * 2, 20), filter_dict, use_cache)
+            return self.fuse_lexical(query, dense, top_k, filter_dict)
         except Exception as e:
             logging.error(f"❌ Search failed: {e}")
             return []
 
-    def upsert_documents(self, documents: List[Dict[str, Any]]) -> None:
-        """Upsert documents to the vector store."""
+    async def asearch(
+        self,
+        query: str,
+        top_k: int = 10,
+        filter_dict: Optional[Dict] = None,
+        use_cache: bool = True,
+        hybrid: Optional[bool] = None,
+    ) -> List[Dict[str, Any]]:
+        """Async ``search``: encoding runs on the encode executor, the index query on the I/O executor."""
+        loop = asyncio.get_running_loop()
+        hybrid = self.hybrid if hybrid is None else hybrid
         try:
-            vectors = []
-            for doc in documents:
-                vector = self.embed_text(doc["text"])
-                sanitized_metadata = self._sanitize_metadata(doc["metadata"])
-                vectors.append({
-                    "id": doc["id"],
-                    "values": vector,
-                    "metadata": sanitized_metadata
-                })
-            
-            self.index.upsert(vectors=vectors)
-            logging.info(f"✅ Upserted {len(vectors)} documents to index '{self.index_name}'")
+            query_vector = await loop.run_in_executor(registry.get_encode_executor(), self.embed_query, query)
+            dense = await loop.run_in_executor(
+                registry.get_io_executor(),
+                functools.partial(
+                    self.query_by_vector, query_vector, max(top_k * 2, 20) if hybrid else top_k, filter_dict, use_cache
+                ),
+            )
+            if not hybrid:
+                return dense
+            return await loop.run_in_executor(
+                registry.get_io_executor(), self.fuse_lexical, query, dense, top_k, filter_dict
+            )
         except Exception as e:
-            logging.error(f"❌ Failed to upsert documents: {e}")
-            raise
+            logging.error(f"❌ Search failed: {e}")
+            return []
+
+    def _timed_query(
+        self, query_vector: List[float], top_k: int, filter_dict: Optional[Dict]
+    ) -> Tuple[List[Dict[str, Any]], float, Optional[str]]:
+        started = time.perf_counter()
+        try:
+            results, error = self.query_by_vector(query_vector, top_k, filter_dict), None
+        except Exception as e:
+            results, error = [], str(e)
+        return results, time.perf_counter() - started, error
+
+    def search_many(
+        self,
+        queries: List[str],
+        top_k: int = 10,
+        filter_dict: Optional[Dict] = None,
+        max_workers: Optional[int] = None,
+    ) -> MultiSearchResult:
+        """
+        Search for many queries at once.
+
+        All queries are encoded in one batched ``encode`` call, then the index queries
+        fan out over a bounded thread pool. Results, latencies and errors are returned
+        in input order; a failing query yields an empty result list.
+        """
+        report = MultiSearchResult()
+        if not queries:
+            return report
+        started = time.perf_counter()
+        try:
+            vectors = self.embed_queries(queries)
+        except Exception as e:
+            logging.error(f"❌ Failed to encode {len(queries)} queries: {e}")
+            report.results = [[] for _ in queries]
+            report.latencies = [0.0 for _ in queries]
+            report.errors = [str(e) for _ in queries]
+            return report
+        report.encode_seconds = time.perf_counter() - started
+
+        workers = max_workers or int(os.getenv("SEARCH_MANY_WORKERS", "8"))
+        with ThreadPoolExecutor(max_workers=min(workers, len(queries))) as pool:
+            outcomes = list(pool.map(lambda v: self._timed_query(v, top_k, filter_dict), vectors))
+        for query, (results, seconds, error) in zip(queries, outcomes):
+            if error:
+                logging.error(f"❌ Search failed for '{query}': {error}")
+            logging.debug(f"🔎 '{query}' took {seconds * 1000:.1f}ms ({len(results)} hits)")
+            report.results.append(results)
+            report.latencies.append(seconds)
+            report.errors.append(error)
+        logging.info(
+            f"🔎 search_many: {len(queries)} queries, encode {report.encode_seconds * 1000:.1f}ms, "
+            f"max query {max(report.latencies) * 1000:.1f}ms"
+        )
+        return report
+
+    async def asearch_many(
+        self,
+        queries: List[str],
+        top_k: int = 10,
+        filter_dict: Optional[Dict] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> MultiSearchResult:
+        """Async ``search_many``: one batched encode, then concurrent index queries on the event loop."""
+        report = MultiSearchResult()
+        if not queries:
+            return report
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            vectors = await loop.run_in_executor(registry.get_encode_executor(), self.embed_queries, queries)
+        except Exception as e:
+            logging.error(f"❌ Failed to encode {len(queries)} queries: {e}")
+            report.results = [[] for _ in queries]
+            report.latencies = [0.0 for _ in queries]
+            report.errors = [str(e) for _ in queries]
+            return report
+        report.encode_seconds = time.perf_counter() - started
+        semaphore = asyncio.Semaphore(max_concurrency or int(os.getenv("ASYNC_SEARCH_CONCURRENCY", "16")))
+
+        async def bounded(vector: List[float]) -> Tuple[List[Dict[str, Any]], float, Optional[str]]:
+            async with semaphore:
+                return await loop.run_in_executor(
+                    registry.get_io_executor(), self._timed_query, vector, top_k, filter_dict
+                )
+
+        for results, seconds, error in await asyncio.gather(*(bounded(v) for v in vectors)):
+            report.results.append(results)
+            report.latencies.append(seconds)
+            report.errors.append(error)
+        return report
+
+    def _chunk_vectors(self, vectors: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Split vectors into upsert requests bounded by count and approximate payload size."""
+        chunks: List[List[Dict[str, Any]]] = []
+        current: List[Dict[str, Any]] = []
+        current_bytes = 0
+        for vector in vectors:
+            size = len(json.dumps(vector, default=str))
+            if current and (len(current) >= self.upsert_batch_size or current_bytes + size > self.upsert_max_bytes):
+                chunks.append(current)
+                current, current_bytes = [], 0
+            current.append(vector)
+            current_bytes += size
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _build_vectors(self, batch: List[Dict[str, Any]], embeddings: List[List[float]]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "id": doc["id"],
+                "values": vector,
+                "metadata": self._sanitize_metadata(doc["metadata"]),
+            }
+            for doc, vector in zip(batch, embeddings)
+        ]
+
+    def _upsert_chunk(self, chunk: List[Dict[str, Any]]) -> float:
+        """Send one upsert request and return its duration in seconds."""
+        started = time.perf_counter()
+        self.index.upsert(vectors=chunk)
+        return time.perf_counter() - started
+
+    def _encode_batch(
+        self, batch_no: int, batch: List[Dict[str, Any]], batch_size: int, report: UpsertReport
+    ) -> Optional[List[List[float]]]:
+        """Encode one batch, recording its timing or failure in ``report``."""
+        started = time.perf_counter()
+        try:
+            embeddings = self.embed_texts([doc["text"] for doc in batch], batch_size=batch_size)
+        except Exception as e:
+            logging.error(f"❌ Failed to encode batch {batch_no} ({len(batch)} documents): {e}")
+            report.failed_chunks.append({
+                "stage": "encode",
+                "batch": batch_no,
+                "ids": [doc["id"] for doc in batch],
+                "error": str(e),
+            })
+            return None
+        encode_seconds = time.perf_counter() - started
+        report.encode_batches.append({"batch": batch_no, "size": len(batch), "seconds": encode_seconds})
+        logging.info(f"🧮 Encoded batch {batch_no} ({len(batch)} docs) in {encode_seconds:.2f}s")
+        return embeddings
+
+    @staticmethod
+    def _record_chunk(report: UpsertReport, chunk: List[Dict[str, Any]], future: Any) -> None:
+        """Record the outcome of a finished upsert future in ``report``."""
+        try:
+            seconds = future.result()
+        except Exception as e:
+            logging.error(f"❌ Failed to upsert chunk of {len(chunk)} vectors: {e}")
+            report.failed_chunks.append({"stage": "upsert", "ids": [v["id"] for v in chunk], "error": str(e)})
+            return
+        report.upserted_count += len(chunk)
+        report.upsert_chunks.append({"size": len(chunk), "seconds": seconds})
+
+    def upsert_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        encode_batch_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+    ) -> UpsertReport:
+        """
+        Upsert documents to the vector store.
+
+        Texts are encoded in batches of ``encode_batch_size``; the resulting vectors are
+        split into size-bounded chunks and uploaded from a bounded thread pool while the
+        next batch is being encoded. Failed chunks are collected in the returned report
+        instead of aborting the whole upsert.
+        """
+        batch_size = encode_batch_size or self.encode_batch_size
+        report = UpsertReport(total_documents=len(documents))
+        if not documents:
+            return report
+
+        futures = {}
+        with ThreadPoolExecutor(max_workers=max_workers or self.upsert_max_workers) as pool:
+            for batch_no, start in enumerate(range(0, len(documents), batch_size)):
+                batch = documents[start:start + batch_size]
+                embeddings = self._encode_batch(batch_no, batch, batch_size, report)
+                if embeddings is None:
+                    continue
+                for chunk in self._chunk_vectors(self._build_vectors(batch, embeddings)):
+                    futures[pool.submit(self._upsert_chunk, chunk)] = chunk
+
+            for future in as_completed(futures):
+                self._record_chunk(report, futures[future], future)
+
+        logging.info(
+            f"✅ Upserted {report.upserted_count}/{report.total_documents} documents to index "
+            f"'{self.index_name}' ({len(report.failed_chunks)} failed chunks)"
+        )
+        return report
+
+    async def aupsert_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        encode_batch_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> UpsertReport:
+        """Async ``upsert_documents``: batches encode on the encode executor while uploads run on the I/O executor."""
+        batch_size = encode_batch_size or self.encode_batch_size
+        report = UpsertReport(total_documents=len(documents))
+        if not documents:
+            return report
+
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max_concurrency or self.upsert_max_workers)
+
+        async def upload(chunk: List[Dict[str, Any]]) -> None:
+            async with semaphore:
+                future = loop.run_in_executor(registry.get_io_executor(), self._upsert_chunk, chunk)
+                await asyncio.wait([future])
+            self._record_chunk(report, chunk, future)
+
+        uploads = []
+        for batch_no, start in enumerate(range(0, len(documents), batch_size)):
+            batch = documents[start:start + batch_size]
+            embeddings = await loop.run_in_executor(
+                registry.get_encode_executor(), self._encode_batch, batch_no, batch, batch_size, report
+            )
+            if embeddings is None:
+                continue
+            for chunk in self._chunk_vectors(self._build_vectors(batch, embeddings)):
+                uploads.append(asyncio.ensure_future(upload(chunk)))
+        await asyncio.gather(*uploads)
+
+        logging.info(
+            f"✅ Upserted {report.upserted_count}/{report.total_documents} documents to index "
+            f"'{self.index_name}' ({len(report.failed_chunks)} failed chunks)"
+        )
+        return report
 
     def get_index_stats(self) -> Dict[str, Any]:
         """Get index statistics."""
@@ -0,0 +1,102 @@
+"""Bounded LRU + TTL cache for query embeddings."""
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace and case so trivially different queries share an entry (bge is uncased)."""
+    return _WHITESPACE.sub(" ", query).strip().casefold()
+
+
+class QueryEmbeddingCache:
+    """Thread-safe LRU cache of query vectors keyed by (model name, normalized query).
+
+    Vectors are held as float32 arrays and expire after ``ttl_seconds``. The cache is
+    tied to a model version: asking for a different version flushes every entry.
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl_seconds: float = 3600.0, model_version: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.model_version = model_version
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _check_version(self, model_version: Optional[str]) -> None:
+        if model_version is not None and model_version != self.model_version:
+            self._entries.clear()
+            self.model_version = model_version
+
+    def get(self, model_name: str, query: str, model_version: Optional[str] = None) -> Optional[np.ndarray]:
+        key = (model_name, normalize_query(query))
+        with self._lock:
+            self._check_version(model_version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            stored_at, vector = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, model_name: str, query: str, vector: Any, model_version: Optional[str] = None) -> np.ndarray:
+        key = (model_name, normalize_query(query))
+        array = np.asarray(vector, dtype=np.float32)
+        array.setflags(write=False)
+        with self._lock:
+            self._check_version(model_version)
+            self._entries[key] = (time.monotonic(), array)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return array
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "model_version": self.model_version,
+            }
+
+
+_cache: Optional[QueryEmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    """Return the process-wide query embedding cache, configured from the environment."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = QueryEmbeddingCache(
+                    max_entries=int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "4096")),
+                    ttl_seconds=float(os.getenv("QUERY_EMBEDDING_CACHE_TTL", "3600")),
+                    model_version=os.getenv("EMBEDDING_VERSION", "bge-v1.5"),
+                )
+    return _cache
@@ -0,0 +1,100 @@
+"""Embedding runtime selection: fp32 PyTorch or (int8-quantized) ONNX Runtime on CPU.
+
+``EMBEDDING_RUNTIME=onnx`` loads models through sentence-transformers' ONNX backend.
+Point ``EMBEDDING_ONNX_PATH`` at a directory produced by
+``scripts/export_onnx_embedding.py`` to use the int8 model exported for
+``EMBEDDING_MODEL_NAME``; other models are exported to fp32 ONNX on first load.
+``ONNX_INTRA_OP_THREADS`` / ``ONNX_INTER_OP_THREADS`` tune the ONNX Runtime session.
+"""
+
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+DEFAULT_QUANTIZED_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+
+def embedding_runtime() -> str:
+    return os.getenv("EMBEDDING_RUNTIME", "torch").lower()
+
+
+def _quantized_source(model_name: str) -> Optional[str]:
+    """Exported model directory when ``model_name`` is the one it was exported from."""
+    path = os.getenv("EMBEDDING_ONNX_PATH")
+    if path and model_name == os.getenv("EMBEDDING_MODEL_NAME", "BAAI/bge-base-en-v1.5"):
+        return path
+    return None
+
+
+def sentence_transformer_args(model_name: str, serializable: bool = False) -> Dict[str, Any]:
+    """Extra ``SentenceTransformer(...)`` arguments for the configured runtime.
+
+    With ``serializable=True`` the ONNX Runtime ``SessionOptions`` object is left out so
+    the arguments can be embedded in a cocoindex flow spec.
+    """
+    if embedding_runtime() != "onnx":
+        return {}
+    model_kwargs: Dict[str, Any] = {"provider": "CPUExecutionProvider"}
+    if _quantized_source(model_name):
+        model_kwargs["file_name"] = os.getenv("EMBEDDING_ONNX_FILE", DEFAULT_QUANTIZED_FILE)
+    if not serializable:
+        import onnxruntime
+        options = onnxruntime.SessionOptions()
+        intra = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))
+        inter = int(os.getenv("ONNX_INTER_OP_THREADS", "0"))
+        if intra:
+            options.intra_op_num_threads = intra
+        if inter:
+            options.inter_op_num_threads = inter
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        model_kwargs["session_options"] = options
+    return {"backend": "onnx", "model_kwargs": model_kwargs}
+
+
+def load_sentence_transformer(model_name: str, device: Optional[str] = None) -> Any:
+    """Load ``model_name`` with the configured runtime."""
+    from sentence_transformers import SentenceTransformer
+    args = sentence_transformer_args(model_name)
+    source = _quantized_source(model_name) if args else None
+    if args:
+        logging.info(f"⚙️ Using ONNX Runtime for {model_name} ({'int8 ' + source if source else 'fp32 export'})")
+        # ONNX Runtime here is CPU-only; the device argument does not apply.
+        return SentenceTransformer(source or model_name, **args)
+    return SentenceTransformer(model_name, device=device)
+
+
+def check_embedding_parity(
+    reference: Any,
+    candidate: Any,
+    texts: List[str],
+    min_cosine: float = 0.99,
+    top_k: int = 5,
+) -> Dict[str, Any]:
+    """Compare a candidate model's vectors with the fp32 reference on ``texts``.
+
+    Reports per-text cosine similarity between the two embeddings and how often the
+    top-k neighbours of each text (within ``texts``) agree. ``passed`` is False when
+    any cosine falls below ``min_cosine``.
+    """
+    ref = np.asarray(reference.encode(texts, convert_to_numpy=True, normalize_embeddings=True), dtype=np.float32)
+    cand = np.asarray(candidate.encode(texts, convert_to_numpy=True, normalize_embeddings=True), dtype=np.float32)
+    cosines = np.sum(ref * cand, axis=1)
+    k = min(top_k, len(texts) - 1)
+    overlap = 1.0
+    if k > 0:
+        ref_sim, cand_sim = ref @ ref.T, cand @ cand.T
+        np.fill_diagonal(ref_sim, -np.inf)
+        np.fill_diagonal(cand_sim, -np.inf)
+        ref_top = np.argsort(-ref_sim, axis=1)[:, :k]
+        cand_top = np.argsort(-cand_sim, axis=1)[:, :k]
+        overlap = float(np.mean([len(set(a) & set(b)) / k for a, b in zip(ref_top, cand_top)]))
+    return {
+        "texts": len(texts),
+        "min_cosine": float(cosines.min()),
+        "mean_cosine": float(cosines.mean()),
+        "topk_overlap": overlap,
+        "threshold": min_cosine,
+        "passed": bool(cosines.min() >= min_cosine),
+    }
@@ -0,0 +1,244 @@
+"""Compact BM25 inverted index and reciprocal rank fusion for hybrid retrieval.
+
+Dense ``bge`` similarity handles identifiers such as ``TMS-123`` or ``seat_limit``
+poorly; this index matches them exactly. Postings are stored CSR-style in flat NumPy
+arrays (``offsets``/``docs``/``tfs``) that are memory-mapped from disk. Updates go to
+an in-memory delta segment and replaced documents are tombstoned; ``save()`` merges
+everything back into a fresh compact base segment.
+"""
+
+import json
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .paths import data_path
+
+_TOKEN = re.compile(r"[A-Za-z0-9]+(?:[-_.][A-Za-z0-9]+)*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it its of on or that the to was were will with".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased tokens; compound identifiers are kept whole and also split into parts."""
+    tokens: List[str] = []
+    for match in _TOKEN.finditer(text or ""):
+        token = match.group(0).lower()
+        if token in _STOPWORDS:
+            continue
+        tokens.append(token)
+        if any(sep in token for sep in "-_."):
+            tokens.extend(part for part in re.split(r"[-_.]", token) if part and part not in _STOPWORDS)
+    return tokens
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """Fuse ranked id lists: score(d) = sum over lists of 1 / (k + rank)."""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class BM25Index:
+    """Incrementally updatable BM25 index over chunk ids."""
+
+    def __init__(self, name: str, path: Optional[str] = None, k1: float = 1.2, b: float = 0.75):
+        self.name = name
+        self.path = Path(path) if path else data_path("lexical", name, "terms.json").parent
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        # base segment (memory-mapped)
+        self._terms: Dict[str, int] = {}
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._docs = np.zeros(0, dtype=np.int32)
+        self._tfs = np.zeros(0, dtype=np.int32)
+        # document table covering base + delta ordinals
+        self._doc_ids: List[str] = []
+        self._doc_len: List[int] = []
+        self._deleted: List[bool] = []
+        self._ordinals: Dict[str, int] = {}
+        # delta segment (in memory)
+        self._delta: Dict[str, List[Tuple[int, int]]] = {}
+        self._dirty = False
+        self._loaded_mtime = 0.0
+        self._load()
+
+    def _load(self) -> None:
+        terms_file = self.path / "terms.json"
+        if not terms_file.exists():
+            return
+        self._loaded_mtime = terms_file.stat().st_mtime
+        self._delta = {}
+        self._terms = json.loads(terms_file.read_text())
+        self._offsets = np.load(self.path / "offsets.npy", mmap_mode="r")
+        self._docs = np.load(self.path / "docs.npy", mmap_mode="r")
+        self._tfs = np.load(self.path / "tfs.npy", mmap_mode="r")
+        self._doc_ids = json.loads((self.path / "doc_ids.json").read_text())
+        self._doc_len = np.load(self.path / "doc_len.npy").tolist()
+        self._deleted = [False] * len(self._doc_ids)
+        self._ordinals = {doc_id: i for i, doc_id in enumerate(self._doc_ids)}
+        logging.info(f"✅ Loaded lexical index '{self.name}' with {len(self._doc_ids)} chunks")
+
+    def refresh(self) -> None:
+        """Pick up a base segment saved by another process (e.g. a sync job)."""
+        terms_file = self.path / "terms.json"
+        with self._lock:
+            if not self._dirty and terms_file.exists() and terms_file.stat().st_mtime > self._loaded_mtime:
+                self._load()
+
+    def _write(self, filename: str, array: Optional[np.ndarray] = None, text: Optional[str] = None) -> None:
+        # Write-then-rename so readers holding a memory map keep a consistent file.
+        target = self.path / filename
+        tmp = target.with_name(f".{filename}.tmp")
+        if array is not None:
+            with open(tmp, "wb") as f:
+                np.save(f, array)
+        else:
+            tmp.write_text(text or "")
+        os.replace(tmp, target)
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Insert or replace one document."""
+        counts = Counter(tokenize(text))
+        with self._lock:
+            self._remove(doc_id)
+            ordinal = len(self._doc_ids)
+            self._doc_ids.append(doc_id)
+            self._doc_len.append(sum(counts.values()))
+            self._deleted.append(False)
+            self._ordinals[doc_id] = ordinal
+            for term, tf in counts.items():
+                self._delta.setdefault(term, []).append((ordinal, tf))
+            self._dirty = True
+
+    def add_documents(self, documents: Iterable[Dict]) -> None:
+        """Index ``{"id", "text"}`` documents, the same shape ``upsert_documents`` takes."""
+        for doc in documents:
+            self.add(doc["id"], doc.get("text", ""))
+
+    def _remove(self, doc_id: str) -> None:
+        ordinal = self._ordinals.pop(doc_id, None)
+        if ordinal is not None:
+            self._deleted[ordinal] = True
+            self._dirty = True
+
+    def delete(self, doc_ids: Iterable[str]) -> None:
+        with self._lock:
+            for doc_id in doc_ids:
+                self._remove(doc_id)
+
+    def _postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        docs, tfs = [], []
+        term_id = self._terms.get(term)
+        if term_id is not None:
+            start, end = int(self._offsets[term_id]), int(self._offsets[term_id + 1])
+            docs.append(np.asarray(self._docs[start:end]))
+            tfs.append(np.asarray(self._tfs[start:end]))
+        delta = self._delta.get(term)
+        if delta:
+            delta_array = np.asarray(delta, dtype=np.int32)
+            docs.append(delta_array[:, 0])
+            tfs.append(delta_array[:, 1])
+        if not docs:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32)
+        return np.concatenate(docs), np.concatenate(tfs)
+
+    def search(self, query: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        """Top-k ``(doc_id, bm25_score)`` pairs for ``query``."""
+        terms = set(tokenize(query))
+        self.refresh()
+        with self._lock:
+            live = len(self._ordinals)
+            if not terms or not live:
+                return []
+            deleted = np.asarray(self._deleted, dtype=bool)
+            doc_len = np.asarray(self._doc_len, dtype=np.float32)
+            avgdl = float(doc_len[~deleted].mean()) or 1.0
+            scores = np.zeros(len(self._doc_ids), dtype=np.float32)
+            for term in terms:
+                docs, tfs = self._postings(term)
+                if docs.size == 0:
+                    continue
+                keep = ~deleted[docs]
+                docs, tfs = docs[keep], tfs[keep].astype(np.float32)
+                if docs.size == 0:
+                    continue
+                idf = math.log(1.0 + (live - docs.size + 0.5) / (docs.size + 0.5))
+                norm = self.k1 * (1.0 - self.b + self.b * doc_len[docs] / avgdl)
+                scores[docs] += idf * tfs * (self.k1 + 1.0) / (tfs + norm)
+            hits = np.flatnonzero(scores)
+            if hits.size == 0:
+                return []
+            k = min(top_k, hits.size)
+            top = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+            top = top[np.argsort(-scores[top])]
+            return [(self._doc_ids[i], float(scores[i])) for i in top]
+
+    def save(self) -> None:
+        """Merge base and delta segments (dropping deleted docs) and write a compact base segment."""
+        with self._lock:
+            if not self._dirty:
+                return
+            remap = {}
+            doc_ids, doc_len = [], []
+            for ordinal, doc_id in enumerate(self._doc_ids):
+                if not self._deleted[ordinal]:
+                    remap[ordinal] = len(doc_ids)
+                    doc_ids.append(doc_id)
+                    doc_len.append(self._doc_len[ordinal])
+
+            vocabulary = sorted(set(self._terms) | set(self._delta))
+            offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+            postings_docs, postings_tfs = [], []
+            terms: Dict[str, int] = {}
+            for term in vocabulary:
+                docs, tfs = self._postings(term)
+                pairs = [(remap[int(d)], int(tf)) for d, tf in zip(docs, tfs) if int(d) in remap]
+                if not pairs:
+                    continue
+                pairs.sort()
+                terms[term] = len(terms)
+                postings_docs.extend(d for d, _ in pairs)
+                postings_tfs.extend(tf for _, tf in pairs)
+                offsets[len(terms)] = len(postings_docs)
+            offsets = offsets[:len(terms) + 1]
+
+            self._write("offsets.npy", offsets)
+            self._write("docs.npy", np.asarray(postings_docs, dtype=np.int32))
+            self._write("tfs.npy", np.asarray(postings_tfs, dtype=np.int32))
+            self._write("doc_len.npy", np.asarray(doc_len, dtype=np.int32))
+            self._write("doc_ids.json", text=json.dumps(doc_ids))
+            # terms.json goes last: its mtime is what other processes watch
+            self._write("terms.json", text=json.dumps(terms))
+
+            self._dirty = False
+            self._load()
+            logging.info(f"💾 Saved lexical index '{self.name}' ({len(doc_ids)} chunks, {len(terms)} terms)")
+
+
+_indexes: Dict[str, BM25Index] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_lexical_index(index_name: str) -> BM25Index:
+    """Return the process-wide BM25 index that shadows a vector index."""
+    with _indexes_lock:
+        index = _indexes.get(index_name)
+        if index is None:
+            index = _indexes[index_name] = BM25Index(index_name)
+    return index
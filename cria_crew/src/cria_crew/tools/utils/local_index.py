@@ -0,0 +1,410 @@
+"""Local in-process vector index exposing the subset of the Pinecone ``Index`` API we use.
+
+Vectors live in a memory-mapped float32 matrix (L2-normalised, so cosine similarity is a
+dot product) and top-k is a vectorised NumPy ``argpartition``. Metadata is kept
+column-wise so ``filter_dict`` expressions evaluate as boolean masks over all rows.
+Select it with ``VECTOR_BACKEND=local``.
+"""
+
+import atexit
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .paths import data_path
+
+_MISSING = object()
+
+
+class ScoredVector:
+    """Query match mirroring Pinecone's attribute and ``.get`` access."""
+
+    def __init__(self, id: str, score: float, metadata: Optional[Dict[str, Any]] = None,
+                 values: Optional[List[float]] = None):
+        self.id = id
+        self.score = score
+        self.metadata = metadata
+        self.values = values
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def __getitem__(self, key: str) -> Any:
+        return getattr(self, key)
+
+
+class QueryResponse:
+    def __init__(self, matches: List[ScoredVector], namespace: str = ""):
+        self.matches = matches
+        self.namespace = namespace
+
+
+class FetchResponse:
+    def __init__(self, vectors: Dict[str, Dict[str, Any]], namespace: str = ""):
+        self.vectors = vectors
+        self.namespace = namespace
+
+
+class IndexStats:
+    def __init__(self, dimension: int, total_vector_count: int, backend: str = "local"):
+        self.dimension = dimension
+        self.total_vector_count = total_vector_count
+        self.backend = backend
+
+
+def _compare(value: Any, op: str, operand: Any) -> bool:
+    """Evaluate one Pinecone filter operator against a single metadata value."""
+    if isinstance(value, list):
+        # Pinecone semantics: a list field matches when any element matches
+        if op == "$ne":
+            return operand not in value
+        if op == "$nin":
+            return not any(v in operand for v in value)
+        return any(_compare(v, op, operand) for v in value)
+    if value is _MISSING or value is None:
+        return op in ("$ne", "$nin")
+    try:
+        if op == "$eq":
+            return value == operand
+        if op == "$ne":
+            return value != operand
+        if op == "$in":
+            return value in operand
+        if op == "$nin":
+            return value not in operand
+        if op == "$gt":
+            return value > operand
+        if op == "$gte":
+            return value >= operand
+        if op == "$lt":
+            return value < operand
+        if op == "$lte":
+            return value <= operand
+        if op == "$exists":
+            return bool(operand)
+    except TypeError:
+        return False
+    raise ValueError(f"Unsupported filter operator '{op}'")
+
+
+def matches_filter(metadata: Dict[str, Any], filter_dict: Optional[Dict[str, Any]]) -> bool:
+    """Check a single metadata dict against a Pinecone-style filter."""
+    if not filter_dict:
+        return True
+    for field, condition in filter_dict.items():
+        if field == "$and":
+            if not all(matches_filter(metadata, sub) for sub in condition):
+                return False
+        elif field == "$or":
+            if not any(matches_filter(metadata, sub) for sub in condition):
+                return False
+        else:
+            value = metadata.get(field, _MISSING)
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+            for op, operand in condition.items():
+                if op == "$exists":
+                    if (value is not _MISSING) != bool(operand):
+                        return False
+                elif not _compare(value, op, operand):
+                    return False
+    return True
+
+
+class ColumnarMetadata:
+    """Metadata stored as one Python list per field, evaluated column-wise for filters."""
+
+    def __init__(self, columns: Optional[Dict[str, List[Any]]] = None, size: int = 0):
+        self.columns: Dict[str, List[Any]] = columns or {}
+        self.size = size
+        self._numeric: Dict[str, np.ndarray] = {}
+
+    def set_row(self, row: int, metadata: Dict[str, Any]) -> None:
+        if row >= self.size:
+            for column in self.columns.values():
+                column.extend([_MISSING] * (row + 1 - self.size))
+            self.size = row + 1
+        for field in list(self.columns):
+            if field not in metadata:
+                self.columns[field][row] = _MISSING
+        for field, value in metadata.items():
+            column = self.columns.get(field)
+            if column is None:
+                column = self.columns[field] = [_MISSING] * self.size
+            column[row] = value
+        self._numeric.clear()
+
+    def row(self, row: int) -> Dict[str, Any]:
+        return {
+            field: column[row]
+            for field, column in self.columns.items()
+            if column[row] is not _MISSING
+        }
+
+    def _numeric_column(self, field: str) -> Optional[np.ndarray]:
+        """Float view of a column when every present value is a scalar number."""
+        cached = self._numeric.get(field)
+        if cached is not None:
+            return cached
+        column = self.columns.get(field, [])
+        out = np.full(self.size, np.nan, dtype=np.float64)
+        for i, value in enumerate(column):
+            if value is _MISSING or value is None:
+                continue
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return None
+            out[i] = value
+        self._numeric[field] = out
+        return out
+
+    def mask(self, filter_dict: Optional[Dict[str, Any]]) -> np.ndarray:
+        """Boolean row mask for a Pinecone-style filter."""
+        result = np.ones(self.size, dtype=bool)
+        if not filter_dict:
+            return result
+        for field, condition in filter_dict.items():
+            if field == "$and":
+                for sub in condition:
+                    result &= self.mask(sub)
+            elif field == "$or":
+                any_mask = np.zeros(self.size, dtype=bool)
+                for sub in condition:
+                    any_mask |= self.mask(sub)
+                result &= any_mask
+            else:
+                if not isinstance(condition, dict):
+                    condition = {"$eq": condition}
+                for op, operand in condition.items():
+                    result &= self._field_mask(field, op, operand)
+        return result
+
+    def _field_mask(self, field: str, op: str, operand: Any) -> np.ndarray:
+        column = self.columns.get(field)
+        if column is None:
+            return np.full(self.size, op in ("$ne", "$nin") or (op == "$exists" and not operand), dtype=bool)
+        if op == "$exists":
+            present = np.fromiter((v is not _MISSING for v in column), dtype=bool, count=self.size)
+            return present if operand else ~present
+        if op in ("$gt", "$gte", "$lt", "$lte") and isinstance(operand, (int, float)):
+            numeric = self._numeric_column(field)
+            if numeric is not None:
+                with np.errstate(invalid="ignore"):
+                    if op == "$gt":
+                        return numeric > operand
+                    if op == "$gte":
+                        return numeric >= operand
+                    if op == "$lt":
+                        return numeric < operand
+                    return numeric <= operand
+        return np.fromiter((_compare(v, op, operand) for v in column), dtype=bool, count=self.size)
+
+    def to_json(self) -> Dict[str, List[Any]]:
+        return {
+            field: [None if v is _MISSING else v for v in column]
+            for field, column in self.columns.items()
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, List[Any]], size: int) -> "ColumnarMetadata":
+        columns = {field: [_MISSING if v is None else v for v in column] for field, column in data.items()}
+        return cls(columns=columns, size=size)
+
+
+class LocalIndex:
+    """Exact cosine-similarity index over a memory-mapped float32 matrix."""
+
+    def __init__(self, name: str, path: Optional[str] = None, flush_interval: float = 30.0):
+        self.name = name
+        self.path = Path(path) if path else data_path("local_index", name, "meta.json").parent
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self.dimension = 0
+        self.count = 0
+        self.capacity = 0
+        self._matrix: Optional[np.memmap] = None
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._metadata = ColumnarMetadata()
+        self._load()
+        atexit.register(self.flush)
+
+    # -- persistence -------------------------------------------------------
+
+    @property
+    def _vectors_file(self) -> Path:
+        return self.path / "vectors.f32"
+
+    def _load(self) -> None:
+        meta_file = self.path / "meta.json"
+        if not meta_file.exists():
+            return
+        meta = json.loads(meta_file.read_text())
+        self.dimension = meta["dimension"]
+        self.count = meta["count"]
+        self.capacity = meta["capacity"]
+        self._ids = json.loads((self.path / "ids.json").read_text())
+        self._rows = {vid: row for row, vid in enumerate(self._ids) if vid is not None}
+        self._alive = np.zeros(self.capacity, dtype=bool)
+        self._alive[:self.count] = [vid is not None for vid in self._ids]
+        self._metadata = ColumnarMetadata.from_json(
+            json.loads((self.path / "metadata.json").read_text()), self.count
+        )
+        if self.capacity:
+            self._matrix = np.memmap(self._vectors_file, dtype=np.float32, mode="r+",
+                                     shape=(self.capacity, self.dimension))
+        logging.info(f"✅ Loaded local index '{self.name}' with {len(self._rows)} vectors")
+
+    def flush(self) -> None:
+        """Persist ids, metadata and the vector matrix to disk."""
+        with self._lock:
+            if not self._dirty:
+                return
+            if self._matrix is not None:
+                self._matrix.flush()
+            (self.path / "ids.json").write_text(json.dumps(self._ids))
+            (self.path / "metadata.json").write_text(json.dumps(self._metadata.to_json(), default=str))
+            (self.path / "meta.json").write_text(json.dumps({
+                "dimension": self.dimension,
+                "count": self.count,
+                "capacity": self.capacity,
+                "metric": "cosine",
+            }))
+            self._dirty = False
+            self._last_flush = time.monotonic()
+
+    def _maybe_flush(self) -> None:
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def _grow(self, needed: int) -> None:
+        if needed <= self.capacity:
+            return
+        new_capacity = max(1024, self.capacity * 2, needed)
+        if self._matrix is not None:
+            self._matrix.flush()
+            del self._matrix
+        with open(self._vectors_file, "ab") as f:
+            f.truncate(new_capacity * self.dimension * 4)
+        self._matrix = np.memmap(self._vectors_file, dtype=np.float32, mode="r+",
+                                 shape=(new_capacity, self.dimension))
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:self.count] = self._alive[:self.count]
+        self._alive = alive
+        self.capacity = new_capacity
+
+    # -- Pinecone-compatible API ---------------------------------------------
+
+    def upsert(self, vectors: Iterable[Dict[str, Any]], namespace: Optional[str] = None, **kwargs) -> Dict[str, int]:
+        vectors = list(vectors)
+        if not vectors:
+            return {"upserted_count": 0}
+        with self._lock:
+            if not self.dimension:
+                self.dimension = len(vectors[0]["values"])
+            values = np.asarray([v["values"] for v in vectors], dtype=np.float32)
+            if values.shape[1] != self.dimension:
+                raise ValueError(f"Vector dimension {values.shape[1]} does not match index dimension {self.dimension}")
+            norms = np.linalg.norm(values, axis=1, keepdims=True)
+            values /= np.where(norms == 0, 1.0, norms)
+
+            new_ids = {v["id"] for v in vectors if v["id"] not in self._rows}
+            self._grow(self.count + len(new_ids))
+            for vector, normalized in zip(vectors, values):
+                row = self._rows.get(vector["id"])
+                if row is None:
+                    row = self.count
+                    self.count += 1
+                    self._ids.append(vector["id"])
+                    self._rows[vector["id"]] = row
+                self._matrix[row] = normalized
+                self._alive[row] = True
+                self._metadata.set_row(row, vector.get("metadata") or {})
+            self._dirty = True
+            self._maybe_flush()
+        return {"upserted_count": len(vectors)}
+
+    def query(
+        self,
+        vector: List[float],
+        top_k: int = 10,
+        filter: Optional[Dict[str, Any]] = None,
+        include_metadata: bool = False,
+        include_values: bool = False,
+        namespace: Optional[str] = None,
+        **kwargs,
+    ) -> QueryResponse:
+        with self._lock:
+            if not self.count or self._matrix is None:
+                return QueryResponse(matches=[])
+            # Snapshot under the lock; the matrix product itself runs without it so
+            # concurrent queries are not serialised.
+            matrix, count = self._matrix, self.count
+            ids = self._ids[:count]
+            candidates = np.flatnonzero(self._alive[:count] & self._metadata.mask(filter))
+            rows_metadata = self._metadata if include_metadata else None
+        if candidates.size == 0:
+            return QueryResponse(matches=[])
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        if candidates.size == count:
+            candidate_scores = matrix[:count] @ query
+        else:
+            candidate_scores = matrix[candidates] @ query
+        k = min(top_k, candidates.size)
+        top = np.argpartition(-candidate_scores, k - 1)[:k]
+        top = top[np.argsort(-candidate_scores[top])]
+        matches = []
+        with self._lock:
+            for i in top:
+                row = int(candidates[i])
+                matches.append(ScoredVector(
+                    id=ids[row],
+                    score=float(candidate_scores[i]),
+                    metadata=rows_metadata.row(row) if rows_metadata is not None else None,
+                    values=matrix[row].tolist() if include_values else None,
+                ))
+        return QueryResponse(matches=matches)
+
+    def fetch(self, ids: List[str], namespace: Optional[str] = None, **kwargs) -> FetchResponse:
+        with self._lock:
+            vectors = {}
+            for vid in ids:
+                row = self._rows.get(vid)
+                if row is None:
+                    continue
+                vectors[vid] = {
+                    "id": vid,
+                    "values": self._matrix[row].tolist(),
+                    "metadata": self._metadata.row(row),
+                }
+            return FetchResponse(vectors=vectors)
+
+    def delete(self, ids: Optional[List[str]] = None, delete_all: bool = False,
+               namespace: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            targets = list(self._rows) if delete_all else (ids or [])
+            for vid in targets:
+                row = self._rows.pop(vid, None)
+                if row is None:
+                    continue
+                self._ids[row] = None
+                self._alive[row] = False
+                self._metadata.set_row(row, {})
+            self._dirty = True
+            self._maybe_flush()
+        return {}
+
+    def describe_index_stats(self, **kwargs) -> IndexStats:
+        with self._lock:
+            return IndexStats(dimension=self.dimension, total_vector_count=len(self._rows))
@@ -0,0 +1,18 @@
+"""Location of local state (caches, local indexes, manifests) kept next to the app."""
+
+import os
+from pathlib import Path
+
+
+def data_dir() -> Path:
+    """Root directory for local data, configurable with ``CRIA_DATA_DIR``."""
+    path = Path(os.getenv("CRIA_DATA_DIR", ".cria_data")).expanduser()
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def data_path(*parts: str) -> Path:
+    """Path under the data directory; parent directories are created on demand."""
+    path = data_dir().joinpath(*parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
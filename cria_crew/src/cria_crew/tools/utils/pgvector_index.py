@@ -0,0 +1,252 @@
+"""pgvector-backed index exposing the subset of the Pinecone ``Index`` API we use.
+
+Each index is a table ``vs_<index_name>`` with an HNSW cosine index on the embedding
+and a GIN index on the JSONB metadata, so Pinecone-style ``filter_dict`` expressions
+are translated into SQL and pushed down. Select it with ``VECTOR_BACKEND=pgvector``;
+it shares the Postgres instance (and connection pool) used for code search.
+"""
+
+import logging
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from psycopg import sql
+from psycopg.types.json import Jsonb
+from psycopg_pool import ConnectionPool
+
+from .local_index import FetchResponse, IndexStats, QueryResponse, ScoredVector
+
+_RANGE_OPS = {"$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}
+
+
+def table_name_for(index_name: str) -> str:
+    """Map an index name such as ``jira-issues`` to a safe table name."""
+    return "vs_" + re.sub(r"[^0-9a-zA-Z_]", "_", index_name).lower()
+
+
+def _eq_clause(field: str, value: Any) -> Tuple[sql.Composable, List[Any]]:
+    # Scalars and list fields both match through GIN-indexable containment.
+    return (
+        sql.SQL("(metadata @> %s OR metadata @> %s)"),
+        [Jsonb({field: value}), Jsonb({field: [value]})],
+    )
+
+
+def _field_clause(field: str, op: str, operand: Any) -> Tuple[sql.Composable, List[Any]]:
+    if op == "$eq":
+        return _eq_clause(field, operand)
+    if op == "$ne":
+        clause, params = _eq_clause(field, operand)
+        return sql.SQL("NOT {}").format(clause), params
+    if op in ("$in", "$nin"):
+        if not operand:
+            return sql.SQL("TRUE" if op == "$nin" else "FALSE"), []
+        parts, params = [], []
+        for value in operand:
+            clause, clause_params = _eq_clause(field, value)
+            parts.append(clause)
+            params.extend(clause_params)
+        joined = sql.SQL("({})").format(sql.SQL(" OR ").join(parts))
+        return (sql.SQL("NOT {}").format(joined) if op == "$nin" else joined), params
+    if op in _RANGE_OPS:
+        comparison = sql.SQL(_RANGE_OPS[op])
+        if isinstance(operand, (int, float)) and not isinstance(operand, bool):
+            return (
+                sql.SQL(
+                    "(CASE WHEN jsonb_typeof(metadata -> %s) = 'number' "
+                    "THEN (metadata ->> %s)::double precision {} %s ELSE FALSE END)"
+                ).format(comparison),
+                [field, field, operand],
+            )
+        return sql.SQL("(metadata ->> %s) {} %s").format(comparison), [field, str(operand)]
+    if op == "$exists":
+        return sql.SQL("(metadata ? %s)" if operand else "NOT (metadata ? %s)"), [field]
+    raise ValueError(f"Unsupported filter operator '{op}'")
+
+
+def filter_to_sql(filter_dict: Optional[Dict[str, Any]]) -> Tuple[sql.Composable, List[Any]]:
+    """Translate a Pinecone-style metadata filter into a SQL boolean expression."""
+    if not filter_dict:
+        return sql.SQL("TRUE"), []
+    parts: List[sql.Composable] = []
+    params: List[Any] = []
+    for field, condition in filter_dict.items():
+        if field in ("$and", "$or"):
+            subs = [filter_to_sql(sub) for sub in condition]
+            joiner = sql.SQL(" AND " if field == "$and" else " OR ")
+            parts.append(sql.SQL("({})").format(joiner.join(clause for clause, _ in subs)))
+            for _, sub_params in subs:
+                params.extend(sub_params)
+            continue
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        for op, operand in condition.items():
+            clause, clause_params = _field_clause(field, op, operand)
+            parts.append(clause)
+            params.extend(clause_params)
+    return sql.SQL(" AND ").join(parts), params
+
+
+class PgVectorIndex:
+    """Cosine-similarity index stored in a pgvector table."""
+
+    def __init__(self, name: str, pool: ConnectionPool, dimension: Optional[int] = None):
+        self.name = name
+        self.pool = pool
+        self.table = table_name_for(name)
+        self.dimension = dimension
+        self._lock = threading.Lock()
+        self._ready = self._table_exists()
+
+    def _table_exists(self) -> bool:
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT to_regclass(%s)", (self.table,)).fetchone()
+        return bool(row and row[0])
+
+    def _ensure_table(self, dimension: int) -> None:
+        if self._ready:
+            return
+        with self._lock:
+            if self._ready:
+                return
+            self.dimension = dimension
+            table = sql.Identifier(self.table)
+            with self.pool.connection() as conn:
+                conn.execute(sql.SQL(
+                    "CREATE TABLE IF NOT EXISTS {} ("
+                    " id TEXT PRIMARY KEY,"
+                    " embedding vector({}) NOT NULL,"
+                    " metadata JSONB NOT NULL DEFAULT '{{}}'::jsonb)"
+                ).format(table, sql.Literal(dimension)))
+                conn.execute(sql.SQL(
+                    "CREATE INDEX IF NOT EXISTS {} ON {} USING hnsw (embedding vector_cosine_ops)"
+                ).format(sql.Identifier(f"{self.table}_embedding_hnsw"), table))
+                conn.execute(sql.SQL(
+                    "CREATE INDEX IF NOT EXISTS {} ON {} USING gin (metadata jsonb_path_ops)"
+                ).format(sql.Identifier(f"{self.table}_metadata_gin"), table))
+            logging.info(f"✅ Prepared pgvector table '{self.table}' ({dimension} dims)")
+            self._ready = True
+
+    def select_sql(self, top_k: int, filter_dict: Optional[Dict[str, Any]], include_values: bool
+                   ) -> Tuple[sql.Composable, List[Any]]:
+        """SELECT statement for one kNN query; the caller supplies the query vector twice."""
+        where, params = filter_to_sql(filter_dict)
+        columns = sql.SQL("id, 1 - (embedding <=> %s) AS score, metadata")
+        if include_values:
+            columns = sql.SQL("{}, embedding").format(columns)
+        query = sql.SQL(
+            "SELECT {} FROM {} WHERE {} ORDER BY embedding <=> %s LIMIT %s"
+        ).format(columns, sql.Identifier(self.table), where)
+        return query, params
+
+    # -- Pinecone-compatible API ---------------------------------------------
+
+    def upsert(self, vectors: Iterable[Dict[str, Any]], namespace: Optional[str] = None, **kwargs) -> Dict[str, int]:
+        vectors = list(vectors)
+        if not vectors:
+            return {"upserted_count": 0}
+        self._ensure_table(len(vectors[0]["values"]))
+        rows = [
+            (v["id"], np.asarray(v["values"], dtype=np.float32), Jsonb(v.get("metadata") or {}))
+            for v in vectors
+        ]
+        with self.pool.connection() as conn, conn.cursor() as cur:
+            cur.executemany(sql.SQL(
+                "INSERT INTO {} (id, embedding, metadata) VALUES (%s, %s, %s) "
+                "ON CONFLICT (id) DO UPDATE SET embedding = EXCLUDED.embedding, metadata = EXCLUDED.metadata"
+            ).format(sql.Identifier(self.table)), rows)
+        return {"upserted_count": len(rows)}
+
+    def query(
+        self,
+        vector: List[float],
+        top_k: int = 10,
+        filter: Optional[Dict[str, Any]] = None,
+        include_metadata: bool = False,
+        include_values: bool = False,
+        namespace: Optional[str] = None,
+        **kwargs,
+    ) -> QueryResponse:
+        if not self._ready:
+            return QueryResponse(matches=[])
+        query_vector = np.asarray(vector, dtype=np.float32)
+        statement, where_params = self.select_sql(top_k, filter, include_values)
+        with self.pool.connection() as conn:
+            rows = conn.execute(statement, [query_vector, *where_params, query_vector, top_k]).fetchall()
+        return QueryResponse(matches=[self._to_match(row, include_metadata, include_values) for row in rows])
+
+    @staticmethod
+    def _to_match(row: Sequence[Any], include_metadata: bool, include_values: bool) -> ScoredVector:
+        return ScoredVector(
+            id=row[0],
+            score=float(row[1]),
+            metadata=row[2] if include_metadata else None,
+            values=np.asarray(row[3]).tolist() if include_values else None,
+        )
+
+    def fetch(self, ids: List[str], namespace: Optional[str] = None, **kwargs) -> FetchResponse:
+        if not self._ready or not ids:
+            return FetchResponse(vectors={})
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                sql.SQL("SELECT id, embedding, metadata FROM {} WHERE id = ANY(%s)").format(sql.Identifier(self.table)),
+                (list(ids),),
+            ).fetchall()
+        return FetchResponse(vectors={
+            row[0]: {"id": row[0], "values": np.asarray(row[1]).tolist(), "metadata": row[2]}
+            for row in rows
+        })
+
+    def delete(self, ids: Optional[List[str]] = None, delete_all: bool = False,
+               namespace: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        if not self._ready:
+            return {}
+        table = sql.Identifier(self.table)
+        with self.pool.connection() as conn:
+            if delete_all:
+                conn.execute(sql.SQL("TRUNCATE {}").format(table))
+            elif ids:
+                conn.execute(sql.SQL("DELETE FROM {} WHERE id = ANY(%s)").format(table), (list(ids),))
+        return {}
+
+    def describe_index_stats(self, **kwargs) -> IndexStats:
+        if not self._ready:
+            return IndexStats(dimension=self.dimension or 0, total_vector_count=0, backend="pgvector")
+        with self.pool.connection() as conn:
+            count = conn.execute(sql.SQL("SELECT count(*) FROM {}").format(sql.Identifier(self.table))).fetchone()[0]
+        return IndexStats(dimension=self.dimension or 0, total_vector_count=count, backend="pgvector")
+
+
+def query_indexes(
+    pool: ConnectionPool,
+    requests: Sequence[Tuple[PgVectorIndex, List[float], int, Optional[Dict[str, Any]]]],
+    include_metadata: bool = True,
+) -> Dict[str, List[ScoredVector]]:
+    """Run several kNN queries (one per index) in a single database round trip.
+
+    ``requests`` holds ``(index, query_vector, top_k, filter_dict)`` tuples; the result
+    maps each index name to its matches in score order.
+    """
+    parts: List[sql.Composable] = []
+    params: List[Any] = []
+    names: List[str] = []
+    for index, vector, top_k, filter_dict in requests:
+        if not index._ready:
+            continue
+        statement, where_params = index.select_sql(top_k, filter_dict, include_values=False)
+        query_vector = np.asarray(vector, dtype=np.float32)
+        parts.append(sql.SQL("(SELECT {} AS source, q.* FROM ({}) q)").format(sql.Literal(len(names)), statement))
+        params.extend([query_vector, *where_params, query_vector, top_k])
+        names.append(index.name)
+    results: Dict[str, List[ScoredVector]] = {index.name: [] for index, *_ in requests}
+    if not parts:
+        return results
+    with pool.connection() as conn:
+        rows = conn.execute(sql.SQL(" UNION ALL ").join(parts), params).fetchall()
+    for row in rows:
+        results[names[row[0]]].append(PgVectorIndex._to_match(row[1:], include_metadata, False))
+    for matches in results.values():
+        matches.sort(key=lambda m: m.score, reverse=True)
+    return results
@@ -0,0 +1,91 @@
+"""Optional cross-encoder rerank stage for retrieval tools.
+
+The tools over-fetch ``candidates`` dense hits, score all (query, chunk) pairs with a
+small CPU cross-encoder in one batch and keep the best ``top_n``. Scoring runs under a
+latency budget; when it runs out (or fails) the dense order is kept instead.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from typing import Any, Callable, Dict, List, Optional
+
+from . import registry
+
+
+def default_rerank_text(result: Dict[str, Any]) -> str:
+    """Text scored for a hit: Jira summary or Confluence title followed by the chunk text."""
+    metadata = result.get("metadata", {}) or {}
+    heading = metadata.get("summary") or metadata.get("title") or ""
+    text = metadata.get("text") or metadata.get("content") or ""
+    if isinstance(text, list):
+        text = " ".join(str(x) for x in text)
+    return f"{heading}\n{text}".strip()
+
+
+class Reranker:
+    """Cross-encoder reranker with a per-call latency budget."""
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        enabled: Optional[bool] = None,
+        candidates: Optional[int] = None,
+        top_n: Optional[int] = None,
+        budget_ms: Optional[float] = None,
+    ):
+        self.model_name = model_name or os.getenv("RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+        self.enabled = enabled if enabled is not None else os.getenv("RERANK_ENABLED", "false").lower() in ("1", "true", "yes")
+        self.candidates = candidates or int(os.getenv("RERANK_CANDIDATES", "30"))
+        self.top_n = top_n or int(os.getenv("RERANK_TOP_N", "5"))
+        self.budget_ms = budget_ms if budget_ms is not None else float(os.getenv("RERANK_BUDGET_MS", "500"))
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rerank")
+
+    def fetch_k(self, top_k: int) -> int:
+        """How many dense candidates a tool should fetch."""
+        return max(top_k, self.candidates) if self.enabled else top_k
+
+    def _score(self, query: str, texts: List[str]) -> List[float]:
+        model = registry.get_cross_encoder(self.model_name)
+        return [float(score) for score in model.predict([(query, text) for text in texts], batch_size=len(texts))]
+
+    def rerank(
+        self,
+        query: str,
+        results: List[Dict[str, Any]],
+        top_n: Optional[int] = None,
+        text_fn: Callable[[Dict[str, Any]], str] = default_rerank_text,
+    ) -> List[Dict[str, Any]]:
+        """Return the best ``top_n`` results by cross-encoder score, or the dense order on timeout."""
+        top_n = top_n or self.top_n
+        if not self.enabled or len(results) <= 1:
+            return results[:top_n] if self.enabled else results
+        started = time.perf_counter()
+        future = self._executor.submit(self._score, query, [text_fn(result) for result in results])
+        try:
+            scores = future.result(timeout=self.budget_ms / 1000.0)
+        except TimeoutError:
+            logging.warning(f"⏱️ Rerank exceeded {self.budget_ms:.0f}ms budget; keeping dense order")
+            return results[:top_n]
+        except Exception as e:
+            logging.error(f"❌ Rerank failed, keeping dense order: {e}")
+            return results[:top_n]
+        ranked = sorted(zip(results, scores), key=lambda pair: pair[1], reverse=True)[:top_n]
+        logging.debug(f"🔀 Reranked {len(results)} candidates in {(time.perf_counter() - started) * 1000:.1f}ms")
+        return [{**result, "rerank_score": score} for result, score in ranked]
+
+
+_reranker: Optional[Reranker] = None
+_reranker_lock = threading.Lock()
+
+
+def get_reranker() -> Reranker:
+    """Return the process-wide reranker configured from the environment."""
+    global _reranker
+    if _reranker is None:
+        with _reranker_lock:
+            if _reranker is None:
+                _reranker = Reranker()
+    return _reranker
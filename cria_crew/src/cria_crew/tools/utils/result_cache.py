@@ -0,0 +1,210 @@
+"""Search result cache invalidated by a per-index sync generation.
+
+Entries are keyed by (index, generation, query vector hash, top_k, filter). The sync
+and load scripts bump the index generation after a successful upsert, which makes
+every older entry unreachable. Use the sqlite backend when the API server and the
+sync jobs run as separate processes, or when entries should survive restarts.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .paths import data_path
+
+
+def make_result_key(
+    index_name: str,
+    generation: int,
+    query_vector: Any,
+    top_k: int,
+    filter_dict: Optional[Dict] = None,
+) -> str:
+    """Stable cache key for one index query."""
+    digest = hashlib.sha256()
+    digest.update(np.asarray(query_vector, dtype=np.float32).tobytes())
+    digest.update(json.dumps(
+        [index_name, generation, top_k, filter_dict or {}],
+        sort_keys=True,
+        default=str,
+    ).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultCacheBackend:
+    """Interface shared by the result cache backends."""
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        raise NotImplementedError
+
+    def put(self, key: str, index_name: str, generation: int, results: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def get_generation(self, index_name: str) -> int:
+        raise NotImplementedError
+
+    def bump_generation(self, index_name: str) -> int:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class InMemoryResultCache(ResultCacheBackend):
+    """Process-local LRU result cache; generations are only visible inside this process."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 86400.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, str, int, List[Dict[str, Any]]]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, _, _, results = entry
+            if time.time() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return results
+
+    def put(self, key: str, index_name: str, generation: int, results: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), index_name, generation, results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_generation(self, index_name: str) -> int:
+        with self._lock:
+            return self._generations.get(index_name, 0)
+
+    def bump_generation(self, index_name: str) -> int:
+        with self._lock:
+            generation = self._generations.get(index_name, 0) + 1
+            self._generations[index_name] = generation
+            stale = [k for k, entry in self._entries.items() if entry[1] == index_name]
+            for k in stale:
+                del self._entries[k]
+            return generation
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SqliteResultCache(ResultCacheBackend):
+    """On-disk result cache shared between processes and across restarts."""
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 10000, ttl_seconds: float = 86400.0):
+        self.path = str(path or data_path("result_cache.sqlite3"))
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY, index_name TEXT NOT NULL, generation INTEGER NOT NULL,"
+                " created REAL NOT NULL, payload TEXT NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS results_created ON results (created)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS generations (index_name TEXT PRIMARY KEY, generation INTEGER NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            row = self._conn.execute("SELECT created, payload FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None or time.time() - row[0] > self.ttl_seconds:
+            return None
+        return json.loads(row[1])
+
+    def put(self, key: str, index_name: str, generation: int, results: List[Dict[str, Any]]) -> None:
+        payload = json.dumps(results, default=str)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, index_name, generation, created, payload) VALUES (?, ?, ?, ?, ?)",
+                (key, index_name, generation, time.time(), payload),
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY created LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+
+    def get_generation(self, index_name: str) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT generation FROM generations WHERE index_name = ?", (index_name,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def bump_generation(self, index_name: str) -> int:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO generations (index_name, generation) VALUES (?, 1) "
+                "ON CONFLICT(index_name) DO UPDATE SET generation = generation + 1",
+                (index_name,),
+            )
+            generation = self._conn.execute(
+                "SELECT generation FROM generations WHERE index_name = ?", (index_name,)
+            ).fetchone()[0]
+            self._conn.execute(
+                "DELETE FROM results WHERE index_name = ? AND generation < ?", (index_name, generation)
+            )
+        return generation
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM results")
+
+
+_cache: Optional[ResultCacheBackend] = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> Optional[ResultCacheBackend]:
+    """Return the configured result cache (``RESULT_CACHE_BACKEND`` = none | memory | sqlite)."""
+    global _cache
+    backend = os.getenv("RESULT_CACHE_BACKEND", "none").lower()
+    if backend in ("", "none", "off"):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                max_entries = int(os.getenv("RESULT_CACHE_SIZE", "10000"))
+                ttl_seconds = float(os.getenv("RESULT_CACHE_TTL", "86400"))
+                if backend == "sqlite":
+                    _cache = SqliteResultCache(
+                        path=os.getenv("RESULT_CACHE_PATH"), max_entries=max_entries, ttl_seconds=ttl_seconds
+                    )
+                elif backend == "memory":
+                    _cache = InMemoryResultCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+                else:
+                    raise ValueError(f"Unknown RESULT_CACHE_BACKEND '{backend}'")
+    return _cache
+
+
+def bump_index_generation(index_name: str) -> Optional[int]:
+    """Invalidate cached results for an index; call after a successful upsert."""
+    cache = get_result_cache()
+    if cache is None:
+        return None
+    generation = cache.bump_generation(index_name)
+    logging.info(f"♻️ Result cache generation for '{index_name}' is now {generation}")
+    return generation
@@ -1,12 +1,30 @@
 """Vector store utility functions for Jira and Confluence data."""
 
 import os
+import threading
+from typing import Dict, Optional, Tuple
 from .data_model import VectorStore
+from . import registry
+
+_stores: Dict[Tuple[str, str, Optional[str]], VectorStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_vectorstore(index_name: str, embedding_model_name: Optional[str] = None) -> VectorStore:
+    """Get the shared vector store for an index; models and index handles come from the registry."""
+    model_name = embedding_model_name or registry.default_embedding_model_name()
+    key = (index_name, model_name, registry.default_device())
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = VectorStore(index_name=index_name, embedding_model_name=model_name, device=key[2])
+            _stores[key] = store
+    return store
 
 
 def get_jira_vectorstore() -> VectorStore:
     """Get or create Jira vector store instance."""
-    return VectorStore(
+    return get_vectorstore(
         index_name=os.getenv("JIRA_INDEX_NAME", "jira-issues"),
         embedding_model_name=os.getenv("EMBEDDING_MODEL_NAME", "BAAI/bge-base-en-v1.5")
     )
@@ -14,7 +32,7 @@ def get_jira_vectorstore() -> VectorStore:
 
 def get_confluence_vectorstore() -> VectorStore:
     """Get or create Confluence vector store instance."""
-    return VectorStore(
+    return get_vectorstore(
         index_name=os.getenv("CONFLUENCE_INDEX_NAME", "confluence-pages"),
         embedding_model_name=os.getenv("EMBEDDING_MODEL_NAME", "BAAI/bge-base-en-v1.5")
     )
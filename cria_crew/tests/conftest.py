@@ -0,0 +1,76 @@
+"""Shared fixtures: an isolated data directory, local backends and a deterministic fake encoder."""
+
+import hashlib
+from typing import Callable, List
+
+import numpy as np
+import pytest
+
+from cria_crew.tools.utils import embedding_cache, lexical_index, registry, reranker, result_cache
+from cria_crew.tools.utils.data_model import VectorStore
+
+MODEL_NAME = "test/fake-encoder"
+
+
+class FakeEncoder:
+    """Hashed bag-of-words encoder with the ``SentenceTransformer.encode`` signature."""
+
+    def __init__(self, dimension: int = 32):
+        self.dimension = dimension
+        self.calls: List[int] = []
+
+    def encode(self, texts, batch_size: int = 32, convert_to_numpy: bool = True, **kwargs) -> np.ndarray:
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        self.calls.append(len(batch))
+        vectors = np.zeros((len(batch), self.dimension), dtype=np.float32)
+        for row, text in enumerate(batch):
+            for token in text.lower().split():
+                vectors[row, int(hashlib.md5(token.encode()).hexdigest(), 16) % self.dimension] += 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors /= norms
+        return vectors[0] if single else vectors
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch, tmp_path):
+    """Point local state at ``tmp_path``, use the local index and reset process-wide singletons."""
+    monkeypatch.setenv("CRIA_DATA_DIR", str(tmp_path / "data"))
+    monkeypatch.setenv("VECTOR_BACKEND", "local")
+    monkeypatch.setenv("RESULT_CACHE_BACKEND", "none")
+    monkeypatch.setenv("HYBRID_SEARCH", "false")
+    monkeypatch.setenv("RERANK_ENABLED", "false")
+    monkeypatch.setattr(embedding_cache, "_cache", None)
+    monkeypatch.setattr(result_cache, "_cache", None)
+    monkeypatch.setattr(reranker, "_reranker", None)
+    monkeypatch.setattr(lexical_index, "_indexes", {})
+    registry.clear_registry()
+    yield tmp_path
+    registry.clear_registry()
+
+
+@pytest.fixture
+def fake_encoder() -> FakeEncoder:
+    """A fake encoder registered as ``MODEL_NAME`` so no model is downloaded."""
+    encoder = FakeEncoder()
+    registry._models[(MODEL_NAME, registry.default_device())] = encoder
+    return encoder
+
+
+@pytest.fixture
+def make_store(fake_encoder) -> Callable[..., VectorStore]:
+    """Build ``VectorStore`` instances over local indexes, encoding with ``fake_encoder``."""
+
+    def make(index_name: str = "test-index") -> VectorStore:
+        return VectorStore(index_name, embedding_model_name=MODEL_NAME)
+
+    return make
+
+
+def make_documents(texts: List[str], **metadata) -> List[dict]:
+    """``{"id", "text", "metadata"}`` documents with ids ``doc-0``, ``doc-1``, ..."""
+    return [
+        {"id": f"doc-{i}", "text": text, "metadata": {"text": text, **metadata}}
+        for i, text in enumerate(texts)
+    ]
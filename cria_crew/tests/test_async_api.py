@@ -0,0 +1,33 @@
+import asyncio
+
+from conftest import make_documents
+
+TEXTS = ["seat limit reached", "login page broken", "billing export fails"]
+
+
+def test_aupsert_then_asearch_matches_the_sync_api(make_store):
+    store = make_store()
+    report = asyncio.run(store.aupsert_documents(make_documents(TEXTS), encode_batch_size=2))
+    assert report.ok and report.upserted_count == 3
+
+    results = asyncio.run(store.asearch("login page broken", top_k=2))
+    assert results[0]["id"] == "doc-1"
+    assert results == store.search("login page broken", top_k=2)
+
+
+def test_concurrent_asearches_return_their_own_results(make_store):
+    store = make_store()
+    store.upsert_documents(make_documents(TEXTS))
+
+    async def run():
+        return await asyncio.gather(*(store.asearch(text, top_k=1) for text in TEXTS))
+
+    assert [hits[0]["id"] for hits in asyncio.run(run())] == ["doc-0", "doc-1", "doc-2"]
+
+
+def test_asearch_many_keeps_input_order(make_store):
+    store = make_store()
+    store.upsert_documents(make_documents(TEXTS))
+    report = asyncio.run(store.asearch_many(list(reversed(TEXTS)), top_k=1, max_concurrency=2))
+    assert [hits[0]["id"] for hits in report.results] == ["doc-2", "doc-1", "doc-0"]
+    assert report.errors == [None, None, None]
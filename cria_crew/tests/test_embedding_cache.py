@@ -0,0 +1,60 @@
+import numpy as np
+
+from cria_crew.tools.utils import embedding_cache
+from cria_crew.tools.utils.embedding_cache import QueryEmbeddingCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = QueryEmbeddingCache(max_entries=2)
+    cache.put("m", "a", [1.0])
+    cache.put("m", "b", [2.0])
+    cache.get("m", "a")
+    cache.put("m", "c", [3.0])
+
+    assert cache.get("m", "b") is None
+    assert cache.get("m", "a") is not None
+    assert cache.get("m", "c") is not None
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(embedding_cache.time, "monotonic", lambda: now[0])
+    cache = QueryEmbeddingCache(ttl_seconds=10)
+    cache.put("m", "q", [1.0])
+    now[0] += 5
+    assert cache.get("m", "q") is not None
+    now[0] += 6
+    assert cache.get("m", "q") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_new_model_version_flushes_entries():
+    cache = QueryEmbeddingCache(model_version="v1")
+    cache.put("m", "q", [1.0], model_version="v1")
+    assert cache.get("m", "q", model_version="v2") is None
+    assert cache.model_version == "v2"
+
+
+def test_queries_differing_in_case_and_spacing_share_an_entry():
+    cache = QueryEmbeddingCache()
+    cache.put("m", "Seat  Limit", [1.0])
+    assert cache.get("m", " seat limit ") is not None
+    assert cache.get("other", "seat limit") is None
+
+
+def test_cached_vectors_are_read_only():
+    vector = QueryEmbeddingCache().put("m", "q", [1.0, 2.0])
+    assert vector.dtype == np.float32
+    assert not vector.flags.writeable
+
+
+def test_embed_query_encodes_repeated_queries_once(make_store, fake_encoder):
+    store = make_store()
+    first = store.embed_query("seat limit")
+    assert store.embed_query("seat limit") == first
+    assert fake_encoder.calls == [1]
+
+    vectors = store.embed_queries(["seat limit", "login", "login"])
+    assert vectors[0] == first and vectors[1] == vectors[2]
+    assert fake_encoder.calls == [1, 1]
+    assert store.query_cache.stats()["hits"] >= 2
@@ -0,0 +1,43 @@
+import numpy as np
+
+from cria_crew.tools.utils.embedding_runtime import (
+    DEFAULT_QUANTIZED_FILE,
+    check_embedding_parity,
+    sentence_transformer_args,
+)
+
+from conftest import FakeEncoder
+
+TEXTS = ["seat limit reached", "login page broken", "billing export fails", "quarterly roadmap"]
+
+
+def test_torch_runtime_needs_no_extra_arguments():
+    assert sentence_transformer_args("BAAI/bge-base-en-v1.5") == {}
+
+
+def test_onnx_runtime_uses_the_exported_int8_file_for_the_configured_model(monkeypatch):
+    monkeypatch.setenv("EMBEDDING_RUNTIME", "onnx")
+    monkeypatch.setenv("EMBEDDING_ONNX_PATH", "models/bge-base-onnx")
+    args = sentence_transformer_args("BAAI/bge-base-en-v1.5", serializable=True)
+    assert args == {
+        "backend": "onnx",
+        "model_kwargs": {"provider": "CPUExecutionProvider", "file_name": DEFAULT_QUANTIZED_FILE},
+    }
+    # Other models are exported to fp32 ONNX instead
+    assert "file_name" not in sentence_transformer_args("other/model", serializable=True)["model_kwargs"]
+
+
+class _NoisyEncoder(FakeEncoder):
+    def encode(self, texts, **kwargs):
+        vectors = super().encode(texts, **kwargs)
+        vectors = vectors + np.random.default_rng(0).normal(0, 0.5, vectors.shape).astype(np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def test_parity_passes_for_identical_models_and_fails_for_drift():
+    same = check_embedding_parity(FakeEncoder(), FakeEncoder(), TEXTS)
+    assert same["passed"] and same["min_cosine"] > 0.999 and same["topk_overlap"] == 1.0
+
+    drifted = check_embedding_parity(FakeEncoder(), _NoisyEncoder(), TEXTS)
+    assert not drifted["passed"]
+    assert drifted["min_cosine"] < 0.99
@@ -0,0 +1,67 @@
+import pytest
+
+from cria_crew.tools.utils.lexical_index import BM25Index, reciprocal_rank_fusion, tokenize
+
+from conftest import make_documents
+
+
+def test_tokenize_keeps_compound_identifiers_and_their_parts():
+    assert tokenize("The seat_limit of TMS-123 is reached") == [
+        "seat_limit", "seat", "limit", "tms-123", "tms", "123", "reached"
+    ]
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "c", "d"]], k=60)
+    assert [doc_id for doc_id, _ in fused] == ["b", "c", "a", "d"]
+    assert fused[0][1] == pytest.approx(1 / 62 + 1 / 61)
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = BM25Index("t", path=str(tmp_path / "bm25"))
+    index.add("1", "seat_limit error in TMS-123")
+    index.add("2", "login page broken")
+    index.add("3", "seat limit reached for tenant")
+    return index
+
+
+def test_search_ranks_exact_identifier_matches(index):
+    assert index.search("TMS-123")[0][0] == "1"
+    assert {doc_id for doc_id, _ in index.search("seat limit")} == {"1", "3"}
+    assert index.search("unrelated words") == []
+
+
+def test_results_are_the_same_before_and_after_save(index, tmp_path):
+    before = index.search("seat limit")
+    index.save()
+    assert index.search("seat limit") == pytest.approx(before)
+    reopened = BM25Index("t", path=str(tmp_path / "bm25"))
+    assert reopened.search("seat limit") == pytest.approx(before)
+    assert len(reopened) == 3
+
+
+def test_replace_and_delete_survive_save(index, tmp_path):
+    index.save()
+    index.add("2", "billing export fails")
+    index.delete(["3"])
+    index.save()
+    reopened = BM25Index("t", path=str(tmp_path / "bm25"))
+    assert reopened.search("login") == []
+    assert reopened.search("billing")[0][0] == "2"
+    assert reopened.search("tenant") == []
+
+
+def test_hybrid_search_adds_lexical_only_hits(make_store):
+    store = make_store()
+    documents = make_documents(["alpha beta", "gamma delta", "TMS-123 epsilon"])
+    store.upsert_documents(documents)
+    store.lexical_index.add_documents(documents)
+
+    fused = store.search("TMS-123", top_k=3, hybrid=True)
+    assert fused[0]["id"] == "doc-2"
+    assert fused[0]["lexical_score"] is not None
+
+    # Lexical hits still have to pass the metadata filter
+    filtered = store.search("TMS-123", top_k=3, hybrid=True, filter_dict={"text": "alpha beta"})
+    assert [hit["id"] for hit in filtered] == ["doc-0"]
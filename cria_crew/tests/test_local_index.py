@@ -0,0 +1,79 @@
+import pytest
+
+from cria_crew.tools.utils.local_index import ColumnarMetadata, LocalIndex, matches_filter
+
+ROWS = [
+    {"status": "Done", "priority": 3, "labels": ["api", "billing"]},
+    {"status": "Open", "priority": 1, "labels": ["ui"]},
+    {"status": "Done", "priority": 2},
+    {"status": "Open", "priority": "high"},
+]
+
+FILTERS = [
+    {"status": "Done"},
+    {"status": {"$ne": "Done"}},
+    {"status": {"$in": ["Open", "Blocked"]}},
+    {"labels": {"$in": ["billing"]}},
+    {"labels": {"$nin": ["ui"]}},
+    {"labels": {"$exists": False}},
+    {"priority": {"$gte": 2}},
+    {"priority": {"$lt": 3}},
+    {"$or": [{"status": "Open"}, {"priority": {"$gt": 2}}]},
+    {"$and": [{"status": "Done"}, {"priority": {"$lte": 2}}]},
+]
+
+
+@pytest.mark.parametrize("filter_dict", FILTERS)
+def test_columnar_mask_agrees_with_row_filter(filter_dict):
+    metadata = ColumnarMetadata()
+    for row, values in enumerate(ROWS):
+        metadata.set_row(row, values)
+    expected = [matches_filter(values, filter_dict) for values in ROWS]
+    assert metadata.mask(filter_dict).tolist() == expected
+
+
+def _vectors(*specs):
+    return [{"id": vid, "values": values, "metadata": metadata} for vid, values, metadata in specs]
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = LocalIndex("idx", path=str(tmp_path / "idx"), flush_interval=3600)
+    index.upsert(_vectors(
+        ("a", [1.0, 0.0], {"status": "Done"}),
+        ("b", [0.8, 0.6], {"status": "Open"}),
+        ("c", [0.0, 1.0], {"status": "Done"}),
+    ))
+    return index
+
+
+def test_query_returns_top_k_by_cosine_similarity(index):
+    matches = index.query([2.0, 0.0], top_k=2, include_metadata=True).matches
+    assert [match.id for match in matches] == ["a", "b"]
+    assert matches[0].score == pytest.approx(1.0)
+    assert matches[1].metadata == {"status": "Open"}
+
+
+def test_query_applies_filter_before_top_k(index):
+    matches = index.query([1.0, 0.0], top_k=5, filter={"status": "Done"}).matches
+    assert [match.id for match in matches] == ["a", "c"]
+
+
+def test_upsert_replaces_and_delete_removes(index):
+    index.upsert(_vectors(("a", [0.0, 1.0], {"status": "Open"})))
+    index.delete(ids=["c"])
+    assert index.fetch(["a", "c"]).vectors["a"]["metadata"] == {"status": "Open"}
+    assert "c" not in index.fetch(["c"]).vectors
+    assert index.describe_index_stats().total_vector_count == 2
+
+
+def test_dimension_mismatch_is_rejected(index):
+    with pytest.raises(ValueError, match="dimension"):
+        index.upsert(_vectors(("d", [1.0, 0.0, 0.0], {})))
+
+
+def test_flushed_vectors_are_loaded_by_a_new_instance(index, tmp_path):
+    index.flush()
+    reader = LocalIndex("idx", path=str(tmp_path / "idx"))
+    assert reader.describe_index_stats().total_vector_count == 3
+    assert reader.query([0.0, 1.0], top_k=1, include_metadata=True).matches[0].metadata == {"status": "Done"}
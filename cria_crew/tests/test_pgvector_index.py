@@ -0,0 +1,51 @@
+import pytest
+
+from psycopg.types.json import Jsonb
+
+from cria_crew.tools.utils.pgvector_index import filter_to_sql, table_name_for
+
+
+def _render(filter_dict):
+    clause, params = filter_to_sql(filter_dict)
+    return clause.as_string(None), [p.obj if isinstance(p, Jsonb) else p for p in params]
+
+
+def test_table_name_is_sanitised():
+    assert table_name_for("Jira-Issues.v2") == "vs_jira_issues_v2"
+
+
+def test_empty_filter_is_true():
+    assert _render(None) == ("TRUE", [])
+
+
+def test_equality_matches_scalars_and_list_fields():
+    clause, params = _render({"status": "Done"})
+    assert clause == "(metadata @> %s OR metadata @> %s)"
+    assert params == [{"status": "Done"}, {"status": ["Done"]}]
+
+
+def test_in_and_nin_expand_to_containment_checks():
+    clause, params = _render({"labels": {"$in": ["a", "b"]}})
+    assert clause == "((metadata @> %s OR metadata @> %s) OR (metadata @> %s OR metadata @> %s))"
+    assert params == [{"labels": "a"}, {"labels": ["a"]}, {"labels": "b"}, {"labels": ["b"]}]
+    assert _render({"labels": {"$nin": []}}) == ("TRUE", [])
+    assert _render({"labels": {"$in": []}}) == ("FALSE", [])
+
+
+def test_numeric_ranges_compare_numbers_only():
+    clause, params = _render({"updated_ts": {"$gte": 10}})
+    assert "jsonb_typeof(metadata -> %s) = 'number'" in clause
+    assert "::double precision >= %s" in clause
+    assert params == ["updated_ts", "updated_ts", 10]
+
+
+def test_nested_boolean_operators_and_exists():
+    clause, params = _render({"$or": [{"status": "Open"}, {"priority": {"$exists": False}}]})
+    assert clause == "((metadata @> %s OR metadata @> %s) OR NOT (metadata ? %s))"
+    assert params == [{"status": "Open"}, {"status": ["Open"]}, "priority"]
+
+
+def test_unknown_operator_is_rejected():
+    with pytest.raises(ValueError, match="Unsupported filter operator"):
+        filter_to_sql({"status": {"$regex": "x"}})
+
@@ -0,0 +1,37 @@
+import threading
+
+from cria_crew.tools.utils import registry
+
+
+def test_embedding_model_is_loaded_once_per_model_and_device(monkeypatch):
+    loads = []
+
+    def load(model_name, device=None):
+        loads.append((model_name, device))
+        return object()
+
+    monkeypatch.setattr(registry, "SentenceTransformer", load)
+    threads = [threading.Thread(target=registry.get_embedding_model, args=("m",)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    first = registry.get_embedding_model("m")
+    assert registry.get_embedding_model("m") is first
+    assert registry.get_embedding_model("m", device="cpu") is not first
+    assert loads == [("m", None), ("m", "cpu")]
+
+
+def test_vector_stores_share_model_and_index_handles(make_store, fake_encoder):
+    first, second = make_store("shared"), make_store("shared")
+    assert first.embedding_model is second.embedding_model is fake_encoder
+    assert first.index is second.index
+    assert make_store("other").index is not first.index
+
+
+def test_clear_registry_drops_cached_handles(make_store):
+    index = make_store("shared").index
+    registry.clear_registry()
+    assert registry.get_index("shared") is not index
+
@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from cria_crew.tools.utils.reranker import Reranker, default_rerank_text
+
+HITS = [{"id": str(i), "metadata": {"title": f"page {i}", "text": f"body {i}"}} for i in range(4)]
+
+
+def make_reranker(monkeypatch, score, budget_ms=1000.0):
+    reranker = Reranker(model_name="fake", enabled=True, candidates=10, top_n=2, budget_ms=budget_ms)
+    monkeypatch.setattr(reranker, "_score", score)
+    return reranker
+
+
+def test_results_are_reordered_by_cross_encoder_score(monkeypatch):
+    reranker = make_reranker(monkeypatch, lambda query, texts: [float(text[-1]) for text in texts])
+    ranked = reranker.rerank("q", HITS)
+    assert [hit["id"] for hit in ranked] == ["3", "2"]
+    assert ranked[0]["rerank_score"] == 3.0
+
+
+def test_disabled_reranker_passes_results_through():
+    reranker = Reranker(enabled=False, candidates=30)
+    assert reranker.rerank("q", HITS) == HITS
+    assert reranker.fetch_k(5) == 5
+    assert Reranker(enabled=True, candidates=30).fetch_k(5) == 30
+
+
+def test_timeout_keeps_dense_order(monkeypatch):
+    release = threading.Event()
+
+    def slow(query, texts):
+        release.wait(5)
+        return [0.0] * len(texts)
+
+    reranker = make_reranker(monkeypatch, slow, budget_ms=20)
+    assert [hit["id"] for hit in reranker.rerank("q", HITS)] == ["0", "1"]
+    release.set()
+
+
+def test_scoring_errors_keep_dense_order(monkeypatch):
+    def broken(query, texts):
+        raise RuntimeError("model failed")
+
+    reranker = make_reranker(monkeypatch, broken)
+    assert [hit["id"] for hit in reranker.rerank("q", HITS)] == ["0", "1"]
+
+
+@pytest.mark.parametrize("metadata, expected", [
+    ({"summary": "Bug", "text": "details"}, "Bug\ndetails"),
+    ({"title": "Page", "content": ["a", "b"]}, "Page\na b"),
+    ({}, ""),
+])
+def test_default_rerank_text(metadata, expected):
+    assert default_rerank_text({"metadata": metadata}) == expected
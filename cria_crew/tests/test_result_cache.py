@@ -0,0 +1,88 @@
+import pytest
+
+from cria_crew.tools.utils import result_cache
+from cria_crew.tools.utils.result_cache import (
+    InMemoryResultCache,
+    SqliteResultCache,
+    get_result_cache,
+    make_result_key,
+)
+
+
+def test_key_depends_on_every_query_parameter():
+    base = make_result_key("idx", 0, [0.1, 0.2], 5, {"status": "Done"})
+    assert base == make_result_key("idx", 0, [0.1, 0.2], 5, {"status": "Done"})
+    assert base != make_result_key("idx", 1, [0.1, 0.2], 5, {"status": "Done"})
+    assert base != make_result_key("idx", 0, [0.1, 0.3], 5, {"status": "Done"})
+    assert base != make_result_key("idx", 0, [0.1, 0.2], 6, {"status": "Done"})
+    assert base != make_result_key("idx", 0, [0.1, 0.2], 5, None)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryResultCache(max_entries=2, ttl_seconds=60)
+    return SqliteResultCache(path=str(tmp_path / "results.sqlite3"), max_entries=2, ttl_seconds=60)
+
+
+def test_bumping_the_generation_invalidates_only_that_index(cache):
+    cache.put("a", "jira", cache.get_generation("jira"), [{"id": "1"}])
+    cache.put("b", "confluence", cache.get_generation("confluence"), [{"id": "2"}])
+
+    assert cache.bump_generation("jira") == 1
+    assert cache.get_generation("jira") == 1
+    assert cache.get("a") is None
+    assert cache.get("b") == [{"id": "2"}]
+
+
+def test_oldest_entries_are_evicted_beyond_max_entries(cache, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache.time, "time", lambda: now[0])
+    for key in ("a", "b", "c"):
+        cache.put(key, "jira", 0, [{"id": key}])
+        now[0] += 1
+    assert cache.get("a") is None
+    assert cache.get("c") == [{"id": "c"}]
+
+
+def test_entries_expire_after_ttl(cache, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache.time, "time", lambda: now[0])
+    cache.put("a", "jira", 0, [{"id": "1"}])
+    now[0] += 61
+    assert cache.get("a") is None
+
+
+def test_sqlite_generations_are_shared_between_instances(tmp_path):
+    path = str(tmp_path / "results.sqlite3")
+    api, sync_job = SqliteResultCache(path=path), SqliteResultCache(path=path)
+    api.put("a", "jira", api.get_generation("jira"), [{"id": "1"}])
+    sync_job.bump_generation("jira")
+    assert api.get_generation("jira") == 1
+    assert api.get("a") is None
+
+
+def test_backend_selection(monkeypatch):
+    assert get_result_cache() is None
+
+    monkeypatch.setenv("RESULT_CACHE_BACKEND", "memory")
+    assert get_result_cache().ttl_seconds == 86400
+
+    monkeypatch.setattr(result_cache, "_cache", None)
+    monkeypatch.setenv("RESULT_CACHE_BACKEND", "sqlite")
+    assert get_result_cache().ttl_seconds == 86400
+
+
+def test_search_serves_repeated_queries_from_the_cache(make_store, monkeypatch):
+    monkeypatch.setenv("RESULT_CACHE_BACKEND", "memory")
+    store = make_store()
+    store.upsert_documents([{"id": "1", "text": "seat limit", "metadata": {"text": "seat limit"}}])
+    calls = []
+    query = store.index.query
+    monkeypatch.setattr(store.index, "query", lambda **kwargs: calls.append(1) or query(**kwargs))
+
+    assert store.search("seat limit", top_k=1) == store.search("seat limit", top_k=1)
+    assert len(calls) == 1
+    store.result_cache.bump_generation(store.index_name)
+    store.search("seat limit", top_k=1)
+    assert len(calls) == 2
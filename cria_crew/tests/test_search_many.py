@@ -0,0 +1,50 @@
+from conftest import make_documents
+
+TEXTS = ["seat limit reached", "login page broken", "billing export fails"]
+
+
+def test_queries_are_encoded_in_one_batch_and_answered_in_order(make_store, fake_encoder):
+    store = make_store()
+    store.upsert_documents(make_documents(TEXTS))
+    fake_encoder.calls.clear()
+
+    report = store.search_many(["billing export fails", "seat limit reached"], top_k=1)
+
+    assert fake_encoder.calls == [2]
+    assert [hits[0]["id"] for hits in report.results] == ["doc-2", "doc-0"]
+    assert len(report.latencies) == 2 and report.errors == [None, None]
+
+
+def test_a_failing_query_yields_an_error_without_failing_the_others(make_store, monkeypatch):
+    store = make_store()
+    store.upsert_documents(make_documents(TEXTS))
+    failing = store.embed_query("login page broken")
+    query = store.index.query
+
+    def flaky(**kwargs):
+        if kwargs["vector"] == failing:
+            raise RuntimeError("boom")
+        return query(**kwargs)
+
+    monkeypatch.setattr(store.index, "query", flaky)
+    report = store.search_many(["seat limit reached", "login page broken"], top_k=1)
+
+    assert report.results[0][0]["id"] == "doc-0"
+    assert report.results[1] == []
+    assert report.errors[0] is None and "boom" in report.errors[1]
+
+
+def test_encoding_failure_fails_every_query(make_store, fake_encoder, monkeypatch):
+    store = make_store()
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("out of memory")
+
+    monkeypatch.setattr(fake_encoder, "encode", fail)
+    report = store.search_many(["a", "b"])
+    assert report.results == [[], []]
+    assert report.errors == ["out of memory", "out of memory"]
+
+
+def test_empty_query_list_returns_an_empty_report(make_store):
+    assert make_store().search_many([]).results == []
@@ -0,0 +1,50 @@
+from conftest import make_documents
+
+
+def test_upsert_encodes_in_batches_and_reports_counts(make_store, fake_encoder):
+    store = make_store()
+    documents = make_documents([f"issue number {i}" for i in range(10)])
+
+    report = store.upsert_documents(documents, encode_batch_size=4)
+
+    assert fake_encoder.calls == [4, 4, 2]
+    assert report.ok
+    assert report.total_documents == report.upserted_count == 10
+    assert [batch["size"] for batch in report.encode_batches] == [4, 4, 2]
+    assert store.get_index_stats()["total_vector_count"] == 10
+
+
+def test_vectors_are_split_by_count_and_payload_size(make_store):
+    store = make_store()
+    store.upsert_batch_size = 3
+    vectors = [{"id": doc["id"], "values": [0.1] * 32, "metadata": doc["metadata"]} for doc in make_documents(["a b c"] * 7)]
+
+    chunks = store._chunk_vectors(vectors)
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+
+    store.upsert_max_bytes = 1
+    assert [len(chunk) for chunk in store._chunk_vectors(vectors)] == [1] * 7
+
+
+def test_failed_chunk_is_reported_without_aborting_the_rest(make_store, monkeypatch):
+    store = make_store()
+    store.upsert_batch_size = 2
+    upsert = store.index.upsert
+
+    def flaky_upsert(vectors, **kwargs):
+        if any(vector["id"] == "doc-3" for vector in vectors):
+            raise RuntimeError("index unavailable")
+        return upsert(vectors=vectors, **kwargs)
+
+    monkeypatch.setattr(store.index, "upsert", flaky_upsert)
+    report = store.upsert_documents(make_documents([f"text {i}" for i in range(6)]))
+
+    assert not report.ok
+    assert report.upserted_count == 4
+    assert report.failed_chunks == [{"stage": "upsert", "ids": ["doc-2", "doc-3"], "error": "index unavailable"}]
+
+
+def test_sanitize_metadata_keeps_primitives_and_stringifies_the_rest(make_store):
+    store = make_store()
+    metadata = store._sanitize_metadata({"n": 1, "labels": ["a", None, 2], "nested": {"k": "v"}, "none": None})
+    assert metadata == {"n": 1, "labels": ["a", "2"], "nested": "{'k': 'v'}", "none": None}